@@ -1,10 +1,26 @@
 
-from .capture import CameraCapture
-from .detector import HandDetector
-from .tracker import HandTracker
-from .gesture import GestureRecognizer
-from .smoother import AdaptiveSmoother
-from .hidemitter import HIDEmitter
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .capture import CameraCapture
+    from .detector import HandDetector
+    from .tracker import HandTracker
+    from .gesture import GestureRecognizer
+    from .smoother import AdaptiveSmoother
+    from .hidemitter import HIDEmitter
+
+# Public classes are imported from their modules on first access, so that
+# importing a light submodule such as aerocontrol.cli does not load OpenCV
+# and MediaPipe
+_EXPORTS = {
+    "CameraCapture": ".capture",
+    "HandDetector": ".detector",
+    "HandTracker": ".tracker",
+    "GestureRecognizer": ".gesture",
+    "AdaptiveSmoother": ".smoother",
+    "HIDEmitter": ".hidemitter",
+}
 
 __all__ = [
     "CameraCapture",
@@ -13,4 +29,13 @@ __all__ = [
     "GestureRecognizer",
     "AdaptiveSmoother",
     "HIDEmitter",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Import public classes lazily (PEP 562)."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
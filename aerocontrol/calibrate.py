@@ -6,7 +6,7 @@ Provides screen coordinate mapping and sensitivity calibration.
 import cv2
 import logging
 import numpy as np
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 
 logger = logging.getLogger(__name__)
@@ -31,6 +31,27 @@ class Calibrator:
         self.screen_points = []
         self.transform_matrix = None
         
+        # Point buffers for getPerspectiveTransform, filled in place
+        self._src_buf = np.empty((4, 2), dtype=np.float32)
+        self._dst_buf = np.empty((4, 2), dtype=np.float32)
+        
+        # Flattened transform coefficients, cached for per-frame mapping
+        self._m00 = self._m01 = self._m02 = 0.0
+        self._m10 = self._m11 = self._m12 = 0.0
+        self._m20 = self._m21 = self._m22 = 0.0
+        
+        # Remap tables for warping whole frames, built on first use
+        self._map1 = None
+        self._map2 = None
+        
+        # Last mapped point, reused while the camera position is unchanged
+        self._last_cam = (None, None)
+        self._last_screen = (0, 0)
+        
+        # Linear fallback scale factors (assumes 640x480 camera frames)
+        self._sx = screen_width / 640.0
+        self._sy = screen_height / 480.0
+        
     def add_calibration_point(self, camera_pos: Tuple[float, float], 
                              screen_pos: Tuple[int, int]):
         """
@@ -56,10 +77,18 @@ class Calibrator:
             return False
         
         try:
-            src_points = np.float32(self.calibration_points[:4])
-            dst_points = np.float32(self.screen_points[:4])
+            self._src_buf[:] = self.calibration_points[:4]
+            self._dst_buf[:] = self.screen_points[:4]
             
-            self.transform_matrix = cv2.getPerspectiveTransform(src_points, dst_points)
+            self.transform_matrix = cv2.getPerspectiveTransform(self._src_buf, self._dst_buf)
+            (self._m00, self._m01, self._m02,
+             self._m10, self._m11, self._m12,
+             self._m20, self._m21, self._m22) = self.transform_matrix.flatten().tolist()
+            
+            # Drop remap tables built for the previous transform
+            self._map1 = self._map2 = None
+            
+            self._last_cam = (None, None)
             logger.info("Calibration transform computed successfully")
             return True
             
@@ -77,31 +106,66 @@ class Calibrator:
         Returns:
             Screen coordinates (x, y)
         """
+        cx, cy = camera_pos
+        
         if self.transform_matrix is None:
             # Simple linear mapping as fallback
-            x = int(camera_pos[0] / 640 * self.screen_width)
-            y = int(camera_pos[1] / 480 * self.screen_height)
+            x = int(cx * self._sx)
+            y = int(cy * self._sy)
             return (x, y)
         
-        # Apply perspective transform
-        point = np.array([[[camera_pos[0], camera_pos[1]]]], dtype=np.float32)
-        transformed = cv2.perspectiveTransform(point, self.transform_matrix)
+        # A steady hand moves sub-pixel after smoothing; reuse the last result
+        last_cx, last_cy = self._last_cam
+        if last_cx is not None and abs(cx - last_cx) < 0.5 and abs(cy - last_cy) < 0.5:
+            return self._last_screen
         
-        x = int(transformed[0][0][0])
-        y = int(transformed[0][0][1])
+        # Apply perspective transform with scalar math; avoids allocating
+        # arrays and dispatching into OpenCV for a single point
+        w = self._m20 * cx + self._m21 * cy + self._m22
+        x = int((self._m00 * cx + self._m01 * cy + self._m02) / w)
+        y = int((self._m10 * cx + self._m11 * cy + self._m12) / w)
         
         # Clamp to screen bounds
         x = max(0, min(x, self.screen_width - 1))
         y = max(0, min(y, self.screen_height - 1))
         
+        self._last_cam = (cx, cy)
+        self._last_screen = (x, y)
         return (x, y)
     
-    def run_wizard(self, camera_capture) -> bool:
+    def warp_frame(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Warp a camera frame into screen space.
+        
+        The remap tables are built on the first call after each
+        compute_transform and reused, so the transform grid is not rebuilt
+        on every call.
+        
+        Args:
+            frame: Camera image
+            
+        Returns:
+            Image of screen size, or the input frame if not calibrated
+        """
+        if self.transform_matrix is None:
+            return frame
+        
+        if self._map1 is None:
+            # With R set to the homography, the rectify map samples each
+            # screen pixel from its camera position (same as warpPerspective)
+            self._map1, self._map2 = cv2.initUndistortRectifyMap(
+                np.eye(3), None, self.transform_matrix, np.eye(3),
+                (self.screen_width, self.screen_height), cv2.CV_16SC2)
+        
+        return cv2.remap(frame, self._map1, self._map2, cv2.INTER_LINEAR)
+    
+    def run_wizard(self, camera_capture, detector_config: Optional[dict] = None) -> bool:
         """
         Run interactive calibration wizard.
         
         Args:
             camera_capture: CameraCapture instance
+            detector_config: HandDetector settings (the config 'detector' section)
             
         Returns:
             True if calibration successful
@@ -123,7 +187,7 @@ class Calibrator:
         from .detector import HandDetector
         from .tracker import HandTracker
         
-        detector = HandDetector()
+        detector = HandDetector(**{**(detector_config or {}), 'draw': True})
         tracker = HandTracker()
         
         for target_x, target_y, target_name in targets:
@@ -144,7 +208,7 @@ class Calibrator:
                     
                     # Get index finger position
                     index_tip = primary_hand['landmarks'][8]
-                    camera_pos = (index_tip['x'], index_tip['y'])
+                    camera_pos = (float(index_tip[0]), float(index_tip[1]))
                     
                     # Draw crosshair
                     cv2.circle(frame, (int(camera_pos[0]), int(camera_pos[1])), 
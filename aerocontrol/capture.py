@@ -1,5 +1,7 @@
 import cv2
 import logging
+import sys
+import threading
 import time
 from typing import Optional, Tuple
 import numpy as np
@@ -8,6 +10,17 @@ import numpy as np
 logger = logging.getLogger(__name__)
 
 
+def _preferred_backend() -> int:
+    """Get the native VideoCapture backend for this platform."""
+    if sys.platform.startswith('linux'):
+        return cv2.CAP_V4L2
+    if sys.platform == 'win32':
+        return cv2.CAP_DSHOW
+    if sys.platform == 'darwin':
+        return cv2.CAP_AVFOUNDATION
+    return cv2.CAP_ANY
+
+
 class CameraCapture:
     """
     Manages camera capture with performance monitoring.
@@ -29,9 +42,20 @@ class CameraCapture:
         self.target_fps = fps
         self.cap: Optional[cv2.VideoCapture] = None
         self.frame_count = 0
-        self.last_fps_time = time.time()
+        self.last_fps_time = time.monotonic()
         self.current_fps = 0.0
         
+        # Latest-frame grabber state
+        self.last_frame_id = 0
+        self.last_frame_time = 0  # monotonic_ns when the frame was grabbed
+        self.dropped_frames = 0
+        self._grab_thread: Optional[threading.Thread] = None
+        self._grab_running = False
+        self._frame_ready = threading.Condition()
+        self._latest_frame: Optional[np.ndarray] = None
+        self._latest_frame_id = 0
+        self._latest_frame_time = 0
+        
     def open(self) -> bool:
         """
         Open the camera device.
@@ -40,17 +64,24 @@ class CameraCapture:
             True if successful, False otherwise
         """
         try:
-            self.cap = cv2.VideoCapture(self.camera_id)
+            self.cap = cv2.VideoCapture(self.camera_id, _preferred_backend())
             
             if not self.cap.isOpened():
                 logger.error(f"Failed to open camera {self.camera_id}")
                 return False
             
+            # Request MJPG before sizing: compressed frames need far less USB
+            # bandwidth than raw YUYV, allowing higher frame rates
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            
             # Set camera properties
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
             self.cap.set(cv2.CAP_PROP_FPS, self.target_fps)
             
+            # Keep only the newest frame in the driver queue
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
             # Verify actual settings
             actual_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             actual_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -58,35 +89,85 @@ class CameraCapture:
             
             logger.info(f"Camera opened: {actual_width}x{actual_height} @ {actual_fps}fps")
             
+            self._start_grabber()
             return True
             
         except Exception as e:
             logger.error(f"Error opening camera: {e}")
             return False
     
+    def _start_grabber(self):
+        """
+        Start the background grabber thread.
+        
+        The driver and OpenCV buffer frames, so after a slow consumer a plain
+        cap.read() returns a stale frame. The grabber reads at full camera
+        rate and keeps only the newest frame for read().
+        """
+        self._latest_frame = None
+        self._grab_running = True
+        self._grab_thread = threading.Thread(target=self._grab_latest, name="aerocontrol-capture",
+                                             daemon=True)
+        self._grab_thread.start()
+    
+    def _grab_latest(self):
+        """Grabber loop: keep the most recent mirrored frame in the slot."""
+        while self._grab_running:
+            if not self.cap.grab():
+                time.sleep(0.01)
+                continue
+            grab_time = time.monotonic_ns()
+            
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            
+            # Flip frame horizontally for mirror effect, in place since each
+            # retrieve returns a fresh buffer (a strided view gets copied by OpenCV)
+            cv2.flip(frame, 1, dst=frame)
+            
+            with self._frame_ready:
+                if self._latest_frame is not None:
+                    self.dropped_frames += 1
+                self._latest_frame = frame
+                self._latest_frame_id += 1
+                self._latest_frame_time = grab_time
+                self._frame_ready.notify_all()
+    
     def read(self) -> Tuple[bool, Optional[np.ndarray]]:
         """
-        Read a frame from the camera.
+        Read the newest frame from the camera.
+        
+        Waits for a frame that has not been returned before; older frames
+        that were never read are dropped.
         
         Returns:
             Tuple of (success, frame)
         """
-        if self.cap is None or not self.cap.isOpened():
+        if self._grab_thread is None:
             return False, None
         
-        ret, frame = self.cap.read()
+        with self._frame_ready:
+            if self._latest_frame is None:
+                self._frame_ready.wait(timeout=1.0)
+            frame = self._latest_frame
+            self._latest_frame = None
+            frame_id = self._latest_frame_id
+            frame_time = self._latest_frame_time
         
-        if ret:
-            self.frame_count += 1
-            self._update_fps()
-            # Flip frame horizontally for mirror effect
-            frame = cv2.flip(frame, 1)
+        if frame is None:
+            return False, None
         
-        return ret, frame
+        # The grabber hands over ownership of the buffer, so no copy is needed
+        self.last_frame_id = frame_id
+        self.last_frame_time = frame_time
+        self.frame_count += 1
+        self._update_fps()
+        return True, frame
     
     def _update_fps(self):
         """Update FPS counter."""
-        current_time = time.time()
+        current_time = time.monotonic()
         elapsed = current_time - self.last_fps_time
         
         if elapsed >= 1.0:
@@ -100,6 +181,12 @@ class CameraCapture:
     
     def close(self):
         """Release camera resources."""
+        if self._grab_thread is not None:
+            self._grab_running = False
+            self._grab_thread.join(timeout=2.0)
+            self._grab_thread = None
+            logger.info(f"Frame grabber stopped: {self.dropped_frames} stale frames dropped")
+        
         if self.cap is not None:
             self.cap.release()
             self.cap = None
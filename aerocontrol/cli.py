@@ -2,12 +2,22 @@
 CLI interface for AeroControl.
 """
 
+import json
 import logging
 import sys
 import yaml
 from pathlib import Path
 import argparse  # Make sure this import is here
 
+# libyaml-backed loader is an order of magnitude faster when available
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Checkout/install directory (where setup.sh puts the hand model)
+_PROJECT_DIR = Path(__file__).resolve().parent.parent
+
 def setup_logging(level=logging.INFO):
     """Setup logging configuration."""
     logging.basicConfig(
@@ -28,16 +38,77 @@ def load_config(config_path: str) -> dict:
         logging.warning(f"Config file not found: {config_path}, using defaults")
         return get_default_config()
     
+    cache_file = config_file.with_name(f".{config_file.name}.json")
+    
     try:
+        mtime_ns = config_file.stat().st_mtime_ns
+        
+        # Reuse the parsed config if the YAML has not changed since caching
+        config = _load_cached_config(cache_file, mtime_ns)
+        if config is not None:
+            logging.info(f"Loaded config from {config_path} (cached)")
+            return config
+        
         with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlLoader)
         logging.info(f"Loaded config from {config_path}")
+        
+        _save_cached_config(cache_file, mtime_ns, config)
         return config
     except Exception as e:
         logging.error(f"Failed to load config: {e}")
         return get_default_config()
 
 
+def _load_cached_config(cache_file: Path, mtime_ns: int):
+    """Load JSON config cache if it matches the YAML modification time."""
+    try:
+        with open(cache_file, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(cached, dict) or cached.get('mtime_ns') != mtime_ns:
+        return None
+    return cached.get('config')
+
+
+def _save_cached_config(cache_file: Path, mtime_ns: int, config):
+    """Write JSON config cache; failures only cost the next startup a YAML parse."""
+    try:
+        with open(cache_file, 'w') as f:
+            json.dump({'mtime_ns': mtime_ns, 'config': config}, f)
+    except (OSError, TypeError, ValueError) as e:
+        logging.debug(f"Could not write config cache: {e}")
+
+
+def resolve_model_path(config: dict, config_path: str) -> dict:
+    """
+    Make a relative detector.model_path absolute.
+    
+    Relative paths are taken relative to the config file's directory, or to
+    the project directory when the config file does not exist, so the model
+    is found regardless of the working directory.
+    
+    Args:
+        config: Loaded configuration (updated in place)
+        config_path: Path the configuration was loaded from
+        
+    Returns:
+        The same configuration dictionary
+    """
+    detector_config = config.setdefault('detector', {})
+    model_path = Path(detector_config.get('model_path', 'hand_landmarker.task')).expanduser()
+    
+    if not model_path.is_absolute():
+        config_file = Path(config_path)
+        base_dir = config_file.resolve().parent if config_file.exists() else _PROJECT_DIR
+        model_path = base_dir / model_path
+    
+    detector_config['model_path'] = str(model_path)
+    return config
+
+
 def get_default_config() -> dict:
     """Get default configuration."""
     return {
@@ -46,12 +117,25 @@ def get_default_config() -> dict:
             'height': 480,
             'fps': 30
         },
+        'detector': {
+            'detect_every': 2,
+            'track_max_error': 20.0,
+            'input_width': 320,
+            'input_height': 240,
+            'model_path': 'hand_landmarker.task',
+            'delegate': 'cpu'
+        },
+        'pipeline': {
+            'threaded': True,
+            'queue_size': 2
+        },
         'smoother': {
             'alpha_base': 0.3,
             'alpha_min': 0.1,
             'alpha_max': 0.7,
             'adaptation_factor': 0.5,
-            'reference_hand_size': 150.0
+            'reference_hand_size': 150.0,
+            'epsilon': 0.5
         },
         'velocity': {
             'gamma': 0.6,
@@ -65,6 +149,11 @@ def get_default_config() -> dict:
             'swipe_min_velocity': 200,
             'swipe_debounce_ms': 500,
             'zoom_threshold': 200
+        },
+        'hid': {
+            'click_delay_ms': 0,
+            'scroll': True,
+            'threaded': True
         }
     }
 
@@ -74,7 +163,7 @@ def main(args):
     from .main import AeroControl
     
     # Load configuration
-    config = load_config(args.config)
+    config = resolve_model_path(load_config(args.config), args.config)
     
     # Create controller
     controller = AeroControl(
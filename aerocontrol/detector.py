@@ -1,20 +1,58 @@
 import cv2
 import mediapipe as mp
 import logging
+import math
+import os
+import threading
+import time
+from collections import deque
 from typing import Optional, List, Tuple
 import numpy as np
 
+from .landmarks import NUM_LANDMARKS, quantize_landmarks
 
 logger = logging.getLogger(__name__)
 
+# Hand skeleton as landmark chains (thumb, fingers, palm) for polyline drawing
+_HAND_CHAINS = [
+    np.array([0, 1, 2, 3, 4]),
+    np.array([0, 5, 6, 7, 8]),
+    np.array([9, 10, 11, 12]),
+    np.array([13, 14, 15, 16]),
+    np.array([0, 17, 18, 19, 20]),
+    np.array([5, 9, 13, 17]),
+]
+
+
+# Largest wrist movement between detections, as a fraction of the frame
+# width, for a detected hand to keep the uid of a previous hand
+_UID_MATCH_DISTANCE = 0.25
+
+# Live-stream submissions whose grayscale frame is kept until their result
+# arrives; older ones are dropped (MediaPipe skips frames when busy)
+_MAX_PENDING_FRAMES = 8
+
+# A detection result: hand data and the grayscale frame it was computed on
+_Detection = Tuple[Optional[List[dict]], Optional[np.ndarray]]
+
+
+MODEL_URL = ("https://storage.googleapis.com/mediapipe-models/hand_landmarker/"
+             "hand_landmarker/float16/latest/hand_landmarker.task")
+
 
 class HandDetector:
     """
-    Hand detection using MediaPipe Hands.
+    Hand detection using MediaPipe.
+    
+    Uses the MediaPipe Tasks HandLandmarker in live-stream mode when the model
+    file is available, falling back to the legacy MediaPipe Hands solution.
     """
     
     def __init__(self, max_hands: int = 2, min_detection_confidence: float = 0.7,
-                 min_tracking_confidence: float = 0.5):
+                 min_tracking_confidence: float = 0.5, detect_every: int = 2,
+                 track_max_error: float = 20.0, input_width: int = 320,
+                 input_height: int = 240, draw: bool = False,
+                 model_path: str = 'hand_landmarker.task', delegate: str = 'cpu'):
         """
         Initialize hand detector.
         
@@ -22,17 +60,121 @@ class HandDetector:
             max_hands: Maximum number of hands to detect
             min_detection_confidence: Minimum confidence for detection
             min_tracking_confidence: Minimum confidence for tracking
+            detect_every: Run full detection every N frames, tracking in between
+            track_max_error: Optical flow error above which tracking is abandoned
+            input_width: Width frames are downscaled to before detection
+            input_height: Height frames are downscaled to before detection
+            draw: Whether draw_landmarks renders anything
+            model_path: Path to the MediaPipe hand_landmarker.task model
+            delegate: HandLandmarker inference delegate, 'cpu' or 'gpu'
         """
         self.max_hands = max_hands
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=max_hands,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+        self.detect_every = max(1, detect_every)
+        self.track_max_error = track_max_error
+        self.input_size = (input_width, input_height)
+        self.draw = draw
+        self.landmarker = None
+        self.hands = None
+        
+        # Live-stream results arrive on a MediaPipe thread as
+        # (timestamp_ms, hands_data). Each is taken once; the gray frames of
+        # pending submissions let a late result be tracked forward.
+        self._result_lock = threading.Lock()
+        self._latest_result: Tuple[int, Optional[List[dict]]] = (-1, None)
+        self._result_size = (1, 1)
+        self._last_timestamp_ms = -1
+        self._taken_timestamp_ms = -1
+        self._submitted: deque = deque(maxlen=_MAX_PENDING_FRAMES)
+        
+        if os.path.exists(model_path):
+            self._init_landmarker(model_path, min_detection_confidence,
+                                  min_tracking_confidence, delegate)
+        elif hasattr(mp, 'solutions'):
+            logger.warning(f"Hand model {model_path} not found, using legacy MediaPipe Hands")
+            self.hands = mp.solutions.hands.Hands(
+                max_num_hands=max_hands,
+                min_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+        else:
+            raise RuntimeError(f"Hand landmark model not found: {model_path}. "
+                               f"Download it from {MODEL_URL}")
+        
+        # Downscale and RGB conversion buffers, allocated on first frame and reused
+        self._small_buf: Optional[np.ndarray] = None
+        self._rgb_buf: Optional[np.ndarray] = None
+        
+        # Detection-to-frame coordinate scale, cached per frame size
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._scale = np.ones(2, dtype=np.float32)
+        
+        # Temporal subsampling state
+        self._frame_idx = 0
+        self._last_hands: Optional[List[dict]] = None
+        self._prev_gray: Optional[np.ndarray] = None
+        self._next_uid = 0
+        
+        self._warmup()
         logger.info("Hand detector initialized")
     
+    def _init_landmarker(self, model_path: str, min_detection_confidence: float,
+                         min_tracking_confidence: float, delegate: str = 'cpu'):
+        """
+        Create a MediaPipe Tasks HandLandmarker in live-stream mode.
+        
+        The GPU delegate falls back to CPU if it cannot be created (no GPU
+        support in the MediaPipe build or no usable OpenGL context).
+        """
+        from mediapipe.tasks.python import BaseOptions, vision
+        
+        def create(mp_delegate):
+            options = vision.HandLandmarkerOptions(
+                base_options=BaseOptions(model_asset_path=model_path, delegate=mp_delegate),
+                running_mode=vision.RunningMode.LIVE_STREAM,
+                num_hands=self.max_hands,
+                min_hand_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence,
+                result_callback=self._on_result
+            )
+            return vision.HandLandmarker.create_from_options(options)
+        
+        if delegate.lower() == 'gpu':
+            try:
+                self.landmarker = create(BaseOptions.Delegate.GPU)
+                logger.info(f"Using MediaPipe HandLandmarker on GPU ({model_path})")
+                return
+            except Exception as e:
+                logger.warning(f"GPU delegate unavailable ({e}), using CPU")
+        
+        self.landmarker = create(BaseOptions.Delegate.CPU)
+        logger.info(f"Using MediaPipe HandLandmarker ({model_path})")
+    
+    def _warmup(self):
+        """
+        Run one blank frame through MediaPipe.
+        
+        The first process() call allocates tensors and initializes the graph;
+        doing it here keeps that stall out of the first live frame.
+        """
+        dummy = np.zeros((self.input_size[1], self.input_size[0], 3), dtype=np.uint8)
+        dummy.flags.writeable = False
+        
+        start = time.perf_counter()
+        try:
+            if self.landmarker is not None:
+                self.landmarker.detect_async(
+                    mp.Image(image_format=mp.ImageFormat.SRGB, data=dummy),
+                    self._next_timestamp_ms())
+                # The blank frame's result must never reach a caller
+                self._taken_timestamp_ms = self._last_timestamp_ms
+            else:
+                self.hands.process(dummy)
+        except Exception as e:
+            logger.warning(f"Hand detector warmup failed: {e}")
+            return
+        
+        logger.info(f"Hand detector warmed up in {(time.perf_counter() - start) * 1000:.1f} ms")
+    
     def detect(self, frame: np.ndarray) -> Optional[List[dict]]:
         """
         Detect hands in frame.
@@ -41,41 +183,272 @@ class HandDetector:
             frame: BGR image from camera
             
         Returns:
-            List of hand data dictionaries or None if no hands detected
+            List of hand data dictionaries or None if no hands detected.
+            Each hand's 'landmarks' is a (21, 3) float32 array of pixel
+            x, y and relative depth z; 'landmarks_i16' holds the rounded
+            (21, 2) int16 pixel coordinates used for gesture checks;
+            'uid' identifies the same physical hand across frames.
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        self._frame_idx += 1
+        small = self._downscale(frame)
+        frame_height, frame_width = frame.shape[:2]
+        detect_frame = self._frame_idx % self.detect_every == 0
         
-        if not results.multi_hand_landmarks:
+        # Between full detections, shift the last hands by optical flow.
+        # Live-stream detections complete later, so tracking also runs on
+        # detection frames until their result arrives.
+        gray = None
+        hands_data = None
+        if self.detect_every > 1:
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+            if self._last_hands is not None and (not detect_frame or self.landmarker is not None):
+                hands_data = self._track_hands(gray)
+        
+        result = None
+        if detect_frame or hands_data is None:
+            result = self._detect_hands(small, frame_width, frame_height, gray)
+        if self.landmarker is not None:
+            result = self._take_result()
+        
+        if result is not None:
+            # A new detection replaces the tracked hands; one computed on an
+            # earlier frame is first tracked forward to this one
+            detected, result_gray = result
+            self._assign_uids(detected, frame_width)
+            hands_data = detected
+            if detected and result_gray is not None and result_gray is not gray:
+                self._last_hands = detected
+                self._prev_gray = result_gray
+                hands_data = self._track_hands(gray) or detected
+        elif gray is None:
+            # No tracking without detect_every; keep the hands until a result
+            hands_data = self._last_hands
+        
+        self._last_hands = hands_data
+        self._prev_gray = gray
+        return hands_data
+    
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Downscale frame to the detection input size.
+        
+        MediaPipe Hands does not need full camera resolution, so conversion
+        and inference run on fewer pixels. Frames already at or below the
+        input size are returned unchanged.
+        """
+        if frame.shape != self._frame_shape:
+            self._frame_shape = frame.shape
+            frame_height, frame_width = frame.shape[:2]
+            if frame_width > self.input_size[0] or frame_height > self.input_size[1]:
+                self._small_buf = np.empty((self.input_size[1], self.input_size[0], 3),
+                                           dtype=frame.dtype)
+                self._scale[:] = (frame_width / self.input_size[0],
+                                  frame_height / self.input_size[1])
+            else:
+                self._small_buf = None
+                self._scale[:] = 1.0
+        
+        if self._small_buf is None:
+            return frame
+        
+        cv2.resize(frame, self.input_size, dst=self._small_buf, interpolation=cv2.INTER_AREA)
+        return self._small_buf
+    
+    def _detect_hands(self, frame: np.ndarray, frame_width: int, frame_height: int,
+                      gray: Optional[np.ndarray]) -> Optional[_Detection]:
+        """
+        Run MediaPipe on the (downscaled) frame and extract hand data.
+        
+        Landmarks are normalized, so they are scaled straight to the
+        original camera frame size.
+        
+        Returns:
+            (hands_data, gray) from the legacy solution, which runs
+            synchronously; None from the HandLandmarker, whose result is
+            collected later by _take_result
+        """
+        # Convert BGR to RGB into the persistent buffer
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        
+        if self.landmarker is not None:
+            # Submit the frame (mp.Image copies it); inference overlaps
+            # with the caller
+            self._result_size = (frame_width, frame_height)
+            timestamp_ms = self._next_timestamp_ms()
+            self._submitted.append((timestamp_ms, gray))
+            self.landmarker.detect_async(
+                mp.Image(image_format=mp.ImageFormat.SRGB, data=self._rgb_buf),
+                timestamp_ms)
             return None
         
-        hands_data = []
-        frame_height, frame_width = frame.shape[:2]
+        # Read-only input lets MediaPipe skip its defensive copy
+        self._rgb_buf.flags.writeable = False
+        try:
+            results = self.hands.process(self._rgb_buf)
+        finally:
+            self._rgb_buf.flags.writeable = True
+        
+        if not results.multi_hand_landmarks:
+            return None, gray
+        
+        raw_landmarks = results.multi_hand_landmarks
+        points = self._landmark_batch([hand.landmark for hand in raw_landmarks],
+                                      frame_width, frame_height)
+        
+        # Get handedness (left/right)
+        if results.multi_handedness:
+            handedness = [h.classification[0].label for h in results.multi_handedness]
+        else:
+            handedness = ["Right"] * len(raw_landmarks)
+        
+        return self._build_hands(points, handedness, raw_landmarks), gray
+    
+    def _on_result(self, result, image, timestamp_ms: int):
+        """HandLandmarker live-stream callback: convert and store the result."""
+        frame_width, frame_height = self._result_size
         
-        for hand_idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-            # Extract landmark coordinates
-            landmarks = []
-            for lm in hand_landmarks.landmark:
-                landmarks.append({
-                    'x': lm.x * frame_width,
-                    'y': lm.y * frame_height,
-                    'z': lm.z  # Relative depth
-                })
+        hands_data = None
+        if result.hand_landmarks:
+            points = self._landmark_batch(result.hand_landmarks, frame_width, frame_height)
             
-            # Get handedness (left/right)
-            handedness = "Right"
-            if results.multi_handedness:
-                handedness = results.multi_handedness[hand_idx].classification[0].label
+            if result.handedness:
+                handedness = [h[0].category_name for h in result.handedness]
+            else:
+                handedness = ["Right"] * len(result.hand_landmarks)
             
-            hands_data.append({
-                'landmarks': landmarks,
-                'handedness': handedness,
-                'raw_landmarks': hand_landmarks
-            })
+            hands_data = self._build_hands(points, handedness, result.hand_landmarks)
+        
+        with self._result_lock:
+            self._latest_result = (timestamp_ms, hands_data)
+    
+    def _take_result(self) -> Optional[_Detection]:
+        """
+        Take the newest live-stream result if no newer one was taken before.
+        
+        Returns:
+            (hands_data, gray): copies of the callback's hand dictionaries,
+            which stay untouched, and the grayscale frame the result was
+            computed on (None if no longer known); None if no new result
+            has completed
+        """
+        with self._result_lock:
+            timestamp_ms, hands_data = self._latest_result
+        if timestamp_ms <= self._taken_timestamp_ms:
+            return None
+        self._taken_timestamp_ms = timestamp_ms
+        
+        gray = None
+        submitted = self._submitted
+        while submitted and submitted[0][0] <= timestamp_ms:
+            submitted_ms, submitted_gray = submitted.popleft()
+            if submitted_ms == timestamp_ms:
+                gray = submitted_gray
+        
+        if hands_data is not None:
+            hands_data = [dict(hand) for hand in hands_data]
+        return hands_data, gray
+    
+    def _next_timestamp_ms(self) -> int:
+        """Get a strictly increasing live-stream timestamp."""
+        timestamp_ms = max(time.monotonic_ns() // 1_000_000, self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+    
+    def _track_hands(self, gray: np.ndarray) -> Optional[List[dict]]:
+        """
+        Track previously detected hands with Lucas-Kanade optical flow.
+        
+        The wrist point of each hand is tracked and all landmarks are shifted
+        by its displacement.
+        
+        Returns:
+            Shifted hand data, or None if tracking failed
+        """
+        points = np.stack([hand['landmarks'] for hand in self._last_hands])
+        
+        # Track in detection-resolution coordinates
+        prev_pts = (points[:, 0, :2] / self._scale).astype(np.float32).reshape(-1, 1, 2)
         
+        next_pts, status, err = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, prev_pts, None)
+        
+        if next_pts is None or not status.all() or err.max() > self.track_max_error:
+            return None
+        
+        deltas = (next_pts - prev_pts).reshape(-1, 2) * self._scale
+        points[:, :, :2] += deltas[:, None, :]
+        
+        hands_data = self._build_hands(points,
+                                       [hand['handedness'] for hand in self._last_hands],
+                                       [hand['raw_landmarks'] for hand in self._last_hands])
+        for hand, last_hand in zip(hands_data, self._last_hands):
+            hand['uid'] = last_hand['uid']
         return hands_data
     
+    def _assign_uids(self, hands_data: Optional[List[dict]], frame_width: int):
+        """
+        Give each detected hand the uid of the nearest previous hand.
+        
+        Pairs are matched closest first by wrist distance, up to
+        _UID_MATCH_DISTANCE of the frame width; unmatched hands get a new
+        uid. Handedness is ignored: the label can flicker between frames
+        and two hands can share it.
+        """
+        if not hands_data:
+            return
+        
+        last_hands = self._last_hands
+        if last_hands:
+            wrists = np.stack([hand['landmarks'][0, :2] for hand in hands_data])
+            last_wrists = np.stack([hand['landmarks'][0, :2] for hand in last_hands])
+            dist = np.linalg.norm(wrists[:, None, :] - last_wrists[None, :, :], axis=2)
+            max_dist = _UID_MATCH_DISTANCE * frame_width
+            
+            unmatched = set(range(len(last_hands)))
+            for flat in np.argsort(dist, axis=None):
+                i, j = divmod(int(flat), len(last_hands))
+                if dist[i, j] > max_dist:
+                    break
+                if 'uid' not in hands_data[i] and j in unmatched:
+                    hands_data[i]['uid'] = last_hands[j]['uid']
+                    unmatched.discard(j)
+        
+        for hand in hands_data:
+            if 'uid' not in hand:
+                hand['uid'] = self._next_uid
+                self._next_uid += 1
+    
+    def _landmark_batch(self, hands_landmarks, frame_width: int,
+                        frame_height: int) -> np.ndarray:
+        """
+        Convert MediaPipe landmark lists to one pixel-space landmark array.
+        
+        Returns:
+            (num_hands, 21, 3) float32 array of x, y, z
+        """
+        points = np.array([(lm.x, lm.y, lm.z) for hand in hands_landmarks for lm in hand],
+                          dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+        points[:, :, 0] *= frame_width
+        points[:, :, 1] *= frame_height
+        return points
+    
+    def _build_hands(self, points: np.ndarray, handedness: List[str],
+                     raw_landmarks) -> List[dict]:
+        """
+        Build hand data dictionaries from a (num_hands, 21, 3) landmark batch.
+        
+        All hands share one array; each dictionary holds a view of its row.
+        The 'uid' is added by the caller (see _assign_uids).
+        """
+        points_i16 = quantize_landmarks(points)
+        return [{
+            'landmarks': points[i],
+            'landmarks_i16': points_i16[i],
+            'handedness': handedness[i],
+            'raw_landmarks': raw_landmarks[i]
+        } for i in range(len(points))]
+    
     def draw_landmarks(self, frame: np.ndarray, hands_data: List[dict]) -> np.ndarray:
         """
         Draw hand landmarks on frame.
@@ -85,37 +458,35 @@ class HandDetector:
             hands_data: List of hand data from detect()
             
         Returns:
-            Frame with drawn landmarks
+            Frame with drawn landmarks (unchanged if drawing is disabled)
         """
+        if not self.draw:
+            return frame
+        
         for hand_data in hands_data:
-            self.mp_draw.draw_landmarks(
-                frame,
-                hand_data['raw_landmarks'],
-                self.mp_hands.HAND_CONNECTIONS
-            )
+            xy = hand_data['landmarks'][:, :2].astype(np.int32)
+            cv2.polylines(frame, [xy[chain] for chain in _HAND_CHAINS], False,
+                          (0, 255, 0), 2)
         return frame
     
-    def get_hand_scale(self, landmarks: List[dict]) -> float:
+    def get_hand_scale(self, points: np.ndarray) -> float:
         """
         Estimate hand scale based on wrist to middle finger distance.
         
         Args:
-            landmarks: Hand landmarks
+            points: Hand landmarks as a (21, 3) array
             
         Returns:
             Distance in pixels (proxy for hand-to-camera distance)
         """
         # Wrist (0) to middle finger tip (12)
-        wrist = landmarks[0]
-        middle_tip = landmarks[12]
-        
-        dx = middle_tip['x'] - wrist['x']
-        dy = middle_tip['y'] - wrist['y']
-        
-        return np.sqrt(dx**2 + dy**2)
+        return math.hypot(points[12, 0] - points[0, 0], points[12, 1] - points[0, 1])
     
     def close(self):
         """Release resources."""
-        if self.hands:
+        if self.landmarker:
+            self.landmarker.close()
+            logger.info("Hand detector closed")
+        elif self.hands:
             self.hands.close()
             logger.info("Hand detector closed")
\ No newline at end of file
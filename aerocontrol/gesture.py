@@ -4,14 +4,27 @@ Detects pinch, swipe, and other hand gestures with state machine logic.
 """
 
 import logging
+import math
 import time
 import numpy as np
 from typing import Optional, Tuple
 from enum import Enum
 
+from .jit import njit
+from .landmarks import quantize_landmarks
+
 
 logger = logging.getLogger(__name__)
 
+# Fingertip and MCP (knuckle) indices: index, middle, ring, pinky
+_TIPS = np.array([8, 12, 16, 20], dtype=np.intp)
+_MCPS = np.array([5, 9, 13, 17], dtype=np.intp)
+
+# Swipe kernel results
+_SWIPE_NONE = 0
+_SWIPE_UP = 1
+_SWIPE_DOWN = 2
+
 
 class GestureType(Enum):
     """Gesture types."""
@@ -25,6 +38,56 @@ class GestureType(Enum):
     PALM_OPEN = 7  # Pause gesture
 
 
+@njit(cache=True, fastmath=True)
+def _swipe_kernel(landmarks, start_y, start_time, current_time,
+                  min_distance, min_velocity, active):
+    """
+    Four-finger swipe state update on the landmark array.
+    
+    Returns:
+        Tuple of (kind, start_y, start_time, active) where kind is one of
+        _SWIPE_NONE, _SWIPE_UP or _SWIPE_DOWN (before debouncing)
+    """
+    # Average Y position of the four fingertips
+    y0 = float(landmarks[8, 1])
+    y1 = float(landmarks[12, 1])
+    y2 = float(landmarks[16, 1])
+    y3 = float(landmarks[20, 1])
+    avg_y = (y0 + y1 + y2 + y3) * 0.25
+    
+    # Fingers must be roughly aligned (low variance in Y position)
+    d0 = y0 - avg_y
+    d1 = y1 - avg_y
+    d2 = y2 - avg_y
+    d3 = y3 - avg_y
+    y_variance = (d0 * d0 + d1 * d1 + d2 * d2 + d3 * d3) * 0.25
+    
+    if y_variance > 400.0:
+        return _SWIPE_NONE, 0.0, 0.0, False
+    
+    # Start swipe tracking
+    if not active:
+        return _SWIPE_NONE, avg_y, current_time, True
+    
+    # Check swipe distance and velocity
+    elapsed = current_time - start_time
+    if elapsed < 0.1:  # Need minimum time to establish velocity
+        return _SWIPE_NONE, start_y, start_time, True
+    
+    displacement = avg_y - start_y
+    disp_abs = -displacement if displacement < 0 else displacement
+    if disp_abs <= min_distance:
+        return _SWIPE_NONE, start_y, start_time, True
+    
+    # velocity > min_velocity, without dividing by elapsed
+    if disp_abs <= min_velocity * elapsed:
+        return _SWIPE_NONE, start_y, start_time, True
+    
+    if displacement < 0:  # Moving up
+        return _SWIPE_UP, start_y, start_time, True
+    return _SWIPE_DOWN, start_y, start_time, True
+
+
 class GestureRecognizer:
     """
     Recognizes hand gestures with debouncing and state machine logic.
@@ -44,16 +107,20 @@ class GestureRecognizer:
         self.pinch_debounce = config.get('pinch_debounce_ms', 200) / 1000.0
         
         # Swipe thresholds
-        self.swipe_min_distance = config.get('swipe_min_distance', 100)
-        self.swipe_min_velocity = config.get('swipe_min_velocity', 200)
+        self.swipe_min_distance = float(config.get('swipe_min_distance', 100))
+        self.swipe_min_velocity = float(config.get('swipe_min_velocity', 200))
         self.swipe_debounce = config.get('swipe_debounce_ms', 500) / 1000.0
         
         # Zoom threshold
         self.zoom_threshold = config.get('zoom_threshold', 200)
         
+        # Squared thresholds so per-frame checks can skip the sqrt
+        self.pinch_threshold_sq = self.pinch_threshold ** 2
+        self.zoom_threshold_sq = self.zoom_threshold ** 2
+        
         # State tracking
         self.current_gesture = GestureType.NONE
-        self.last_gesture_time = 0
+        self.last_gesture_time = float('-inf')
         self.is_pinching = False
         self.is_dragging = False
         
@@ -62,6 +129,16 @@ class GestureRecognizer:
         self.swipe_start_time = None
         self.swipe_active = False
         
+        # Checked once so disabled debug logging costs a single branch per site
+        self._log_debug = logger.isEnabledFor(logging.DEBUG)
+        
+        # Compile the swipe kernel now rather than on the first live frame
+        start = time.perf_counter()
+        _swipe_kernel(np.zeros((21, 2), dtype=np.int16), 0.0, 0.0, 0.0,
+                      self.swipe_min_distance, self.swipe_min_velocity, False)
+        if self._log_debug:
+            logger.debug(f"Swipe kernel warmed up in {(time.perf_counter() - start) * 1000:.1f} ms")
+        
         logger.info("Gesture recognizer initialized")
     
     def recognize(self, hand_data: dict, dt: float) -> Tuple[GestureType, dict]:
@@ -75,15 +152,12 @@ class GestureRecognizer:
         Returns:
             Tuple of (gesture_type, gesture_data)
         """
-        landmarks = hand_data['landmarks']
-        current_time = time.time()
-        
-        # Extract key landmarks
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
-        middle_tip = landmarks[12]
-        ring_tip = landmarks[16]
-        pinky_tip = landmarks[20]
+        # Integer pixel coordinates; thresholds are whole pixels
+        landmarks = hand_data.get('landmarks_i16')
+        if landmarks is None:
+            landmarks = quantize_landmarks(hand_data['landmarks'])
+        current_time = time.monotonic()
+        pinch_threshold_sq = self.pinch_threshold_sq
         
         # Check for palm open (all fingers extended)
         if self._is_palm_open(landmarks):
@@ -94,112 +168,100 @@ class GestureRecognizer:
         if swipe_gesture != GestureType.NONE:
             return swipe_gesture, {}
         
-        # Check for pinch (index + thumb)
-        pinch_dist = self._distance(thumb_tip, index_tip)
+        # Squared thumb distances to the index, middle and pinky tips, from
+        # one conversion of the landmarks to Python ints
+        points = landmarks.tolist()
+        thumb_x, thumb_y = points[4]
+        index_x, index_y = points[8]
+        dx, dy = index_x - thumb_x, index_y - thumb_y
+        pinch_dist_sq = dx * dx + dy * dy
+        dx, dy = points[12][0] - thumb_x, points[12][1] - thumb_y
+        middle_dist_sq = dx * dx + dy * dy
+        dx, dy = points[20][0] - thumb_x, points[20][1] - thumb_y
+        spread_dist_sq = dx * dx + dy * dy
         
-        if pinch_dist < self.pinch_threshold:
+        # Check for pinch (index + thumb)
+        if pinch_dist_sq < pinch_threshold_sq:
             # Debounce pinch detection
             if not self.is_pinching:
                 if current_time - self.last_gesture_time > self.pinch_debounce:
                     self.is_pinching = True
                     self.last_gesture_time = current_time
-                    logger.debug("Pinch detected")
-                    return GestureType.PINCH, {'position': (index_tip['x'], index_tip['y'])}
+                    if self._log_debug:
+                        logger.debug("Pinch detected")
+                    return GestureType.PINCH, {'position': (float(index_x), float(index_y))}
             else:
                 # Check if dragging
                 self.is_dragging = True
-                return GestureType.DRAG, {'position': (index_tip['x'], index_tip['y'])}
+                return GestureType.DRAG, {'position': (float(index_x), float(index_y))}
         else:
             # Release pinch
             if self.is_pinching:
                 self.is_pinching = False
                 self.is_dragging = False
-                logger.debug("Pinch released")
+                if self._log_debug:
+                    logger.debug("Pinch released")
         
         # Check for right-click (thumb + middle finger)
-        middle_dist = self._distance(thumb_tip, middle_tip)
-        if middle_dist < self.pinch_threshold:
+        if middle_dist_sq < pinch_threshold_sq:
             if current_time - self.last_gesture_time > self.pinch_debounce:
                 self.last_gesture_time = current_time
-                logger.debug("Right-click detected")
+                if self._log_debug:
+                    logger.debug("Right-click detected")
                 return GestureType.RIGHT_CLICK, {}
         
         # Check for zoom (spread fingers)
-        spread_dist = self._distance(thumb_tip, pinky_tip)
-        if spread_dist > self.zoom_threshold:
-            return GestureType.ZOOM, {'spread': spread_dist}
+        if spread_dist_sq > self.zoom_threshold_sq:
+            return GestureType.ZOOM, {'spread': math.sqrt(spread_dist_sq)}
         
         return GestureType.NONE, {}
     
-    def _distance(self, point1: dict, point2: dict) -> float:
-        """Calculate Euclidean distance between two points."""
-        dx = point1['x'] - point2['x']
-        dy = point1['y'] - point2['y']
-        return np.sqrt(dx**2 + dy**2)
-    
-    def _is_palm_open(self, landmarks: list) -> bool:
+    def _is_palm_open(self, landmarks: np.ndarray) -> bool:
         """
         Check if palm is open (all fingers extended).
         Uses simple heuristic: all fingertips above their respective MCP joints.
         """
-        # Fingertip and MCP (knuckle) indices
-        finger_tips = [8, 12, 16, 20]  # Index, middle, ring, pinky
-        finger_mcps = [5, 9, 13, 17]
-        
-        extended_count = 0
-        for tip_idx, mcp_idx in zip(finger_tips, finger_mcps):
-            if landmarks[tip_idx]['y'] < landmarks[mcp_idx]['y'] - 20:
-                extended_count += 1
+        extended = landmarks[_TIPS, 1] < landmarks[_MCPS, 1] - 20
         
         # Consider palm open if at least 3 fingers extended
-        return extended_count >= 3
+        return np.count_nonzero(extended) >= 3
     
-    def _check_four_finger_swipe(self, landmarks: list, current_time: float) -> GestureType:
+    def _check_four_finger_swipe(self, landmarks: np.ndarray, current_time: float) -> GestureType:
         """
         Detect four-finger vertical swipe for desktop switching.
         Uses state machine with hysteresis to avoid false positives.
         """
-        # Get average Y position of four fingertips
-        finger_tips = [8, 12, 16, 20]
-        avg_y = sum(landmarks[i]['y'] for i in finger_tips) / len(finger_tips)
-        
-        # Check if four fingers are detected and relatively aligned
-        # (simple heuristic: variance in Y position is low)
-        y_positions = [landmarks[i]['y'] for i in finger_tips]
-        y_variance = np.var(y_positions)
+        kind, start_y, start_time, active = _swipe_kernel(
+            landmarks,
+            self.swipe_start_y if self.swipe_active else 0.0,
+            self.swipe_start_time if self.swipe_active else 0.0,
+            current_time,
+            self.swipe_min_distance,
+            self.swipe_min_velocity,
+            self.swipe_active
+        )
         
-        if y_variance > 400:  # Fingers not aligned
+        if not active:  # Fingers not aligned
             self._reset_swipe_state()
             return GestureType.NONE
         
-        # Start swipe tracking
-        if not self.swipe_active:
-            self.swipe_start_y = avg_y
-            self.swipe_start_time = current_time
-            self.swipe_active = True
-            return GestureType.NONE
-        
-        # Check swipe distance and velocity
-        displacement = avg_y - self.swipe_start_y
-        elapsed = current_time - self.swipe_start_time
+        self.swipe_start_y = start_y
+        self.swipe_start_time = start_time
+        self.swipe_active = True
         
-        if elapsed < 0.1:  # Need minimum time to establish velocity
+        if kind == _SWIPE_NONE:
             return GestureType.NONE
         
-        velocity = abs(displacement) / elapsed
-        
-        # Detect swipe up or down
-        if abs(displacement) > self.swipe_min_distance and velocity > self.swipe_min_velocity:
-            if current_time - self.last_gesture_time > self.swipe_debounce:
-                self.last_gesture_time = current_time
-                self._reset_swipe_state()
-                
-                if displacement < 0:  # Moving up
-                    logger.info("Swipe UP detected for desktop switch")
-                    return GestureType.SWIPE_UP
-                else:  # Moving down
-                    logger.info("Swipe DOWN detected for desktop switch")
-                    return GestureType.SWIPE_DOWN
+        if current_time - self.last_gesture_time > self.swipe_debounce:
+            self.last_gesture_time = current_time
+            self._reset_swipe_state()
+            
+            if kind == _SWIPE_UP:
+                logger.info("Swipe UP detected for desktop switch")
+                return GestureType.SWIPE_UP
+            else:
+                logger.info("Swipe DOWN detected for desktop switch")
+                return GestureType.SWIPE_DOWN
         
         return GestureType.NONE
     
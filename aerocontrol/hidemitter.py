@@ -1,11 +1,19 @@
 """
 HID event emitter module.
-Emits mouse and keyboard events using uinput (preferred) or pyautogui fallback.
+Emits mouse and keyboard events using uinput (preferred) or an X11 fallback
+(XTest, or pyautogui when it is installed).
 """
 
+import ctypes
+import ctypes.util
 import logging
+import queue
+import re
 import subprocess
 import os
+import shutil
+import struct
+import threading
 from typing import Tuple, Optional
 import time
 import uinput 
@@ -13,14 +21,31 @@ import uinput
 
 logger = logging.getLogger(__name__)
 
+# One `wmctrl -d` line: desktop index followed by '*' (current) or '-'
+_WMCTRL_RE = re.compile(rb'^(\d+)\s+([*\-])', re.M)
+
+# Linux struct input_event: struct timeval (native longs), __u16 type,
+# __u16 code, __s32 value. The kernel stamps the time on uinput writes.
+_INPUT_EVENT = struct.Struct('llHHi')
+# (EV_SYN, SYN_REPORT) event and value
+_SYN_REPORT = ((0, 0), 0)
+# Largest batch written at once (click: press, SYN, release, SYN)
+_MAX_BATCH_EVENTS = 4
+
+# X11 core pointer buttons, including the wheel as buttons 4 (up) and 5 (down)
+_X_BUTTONS = {'left': 1, 'middle': 2, 'right': 3}
+_X_WHEEL_UP = 4
+_X_WHEEL_DOWN = 5
+
 
 class HIDEmitter:
     """
     Emits HID events for mouse and desktop control.
-    Attempts uinput first, falls back to pyautogui + wmctrl/xdotool.
+    Attempts uinput first, falls back to XTest (or pyautogui) + wmctrl/xdotool.
     """
     
-    def __init__(self, screen_width: int, screen_height: int, use_uinput: bool = True):
+    def __init__(self, screen_width: int, screen_height: int, use_uinput: bool = True,
+                 click_delay: float = 0.0, enable_scroll: bool = True):
         """
         Initialize HID emitter.
         
@@ -28,19 +53,56 @@ class HIDEmitter:
             screen_width: Screen width in pixels
             screen_height: Screen height in pixels
             use_uinput: Whether to attempt uinput (requires permissions)
+            click_delay: Seconds to hold a button during click (0 = none)
+            enable_scroll: Whether to register and emit wheel events
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.click_delay = click_delay
+        self.enable_scroll = enable_scroll
         self.use_uinput = use_uinput and self._check_uinput()
         
         self.device = None
+        self._uinput_fd = -1
+        self._event_buf = bytearray(_INPUT_EVENT.size * _MAX_BATCH_EVENTS)
+        self._event_view = memoryview(self._event_buf)
         self.pyautogui = None
         self.desktop_tool = None
+        self._x11 = None
+        self._xtst = None
+        self._xdisplay = None
+        self._num_desktops: Optional[int] = None
+        
+        # Checked once so debug messages cost nothing when disabled
+        self._log_debug = logger.isEnabledFor(logging.DEBUG)
+        
+        # Cache event codes so hot paths avoid module attribute lookups
+        self._REL_X = uinput.REL_X
+        self._REL_Y = uinput.REL_Y
+        self._REL_WHEEL = uinput.REL_WHEEL
+        self._BTN_LEFT = uinput.BTN_LEFT
+        self._BTN_RIGHT = uinput.BTN_RIGHT
+        self._BTN_MIDDLE = uinput.BTN_MIDDLE
+        self._button_map = {
+            'left': self._BTN_LEFT,
+            'right': self._BTN_RIGHT,
+            'middle': self._BTN_MIDDLE
+        }
         
         # Track current mouse position for uinput relative movements
         self.current_x = screen_width // 2
         self.current_y = screen_height // 2
         
+        # Background emitter state: cursor moves are coalesced to the latest
+        # target, discrete actions are kept in order
+        self._pending_xy: Optional[Tuple[int, int]] = None
+        self._pending_lock = threading.Lock()
+        self._actions: queue.Queue = queue.Queue()
+        self._wake = threading.Event()
+        self._emit_thread: Optional[threading.Thread] = None
+        self._emit_running = False
+        self.coalesced_moves = 0
+        
         if self.use_uinput:
             self._init_uinput()
         else:
@@ -49,82 +111,246 @@ class HIDEmitter:
     def _check_uinput(self) -> bool:
         """Check if uinput is available."""
         try:
-            import uinput
             # Check if /dev/uinput exists and is accessible
             if os.path.exists('/dev/uinput'):
                 return True
-            logger.warning("/dev/uinput not found, falling back to pyautogui")
-            return False
-        except ImportError:
-            logger.warning("python-uinput not installed, falling back to pyautogui")
+            logger.warning("/dev/uinput not found, falling back to X11")
             return False
         except Exception as e:
-            logger.warning(f"uinput check failed: {e}, falling back to pyautogui")
+            logger.warning(f"uinput check failed: {e}, falling back to X11")
             return False
     
+    def _device_events(self) -> list:
+        """
+        Get the capabilities to register on the uinput device.
+        
+        Only the events actually emitted are listed. Devices that advertise
+        whole key ranges can fail with -ENOMEM when udev processes them,
+        and needlessly look like keyboards.
+        """
+        events = [
+            self._BTN_LEFT,
+            self._BTN_RIGHT,
+            self._BTN_MIDDLE,
+            self._REL_X,
+            self._REL_Y,
+        ]
+        if self.enable_scroll:
+            events.append(self._REL_WHEEL)
+        return events
+    
     def _init_uinput(self):
         """Initialize uinput virtual HID device."""
         try:
-            import uinput
+            events = self._device_events()
             
-            events = (
-                uinput.BTN_LEFT,
-                uinput.BTN_RIGHT,
-                uinput.BTN_MIDDLE,
-                uinput.REL_X,
-                uinput.REL_Y,
-                uinput.REL_WHEEL,
-            )
-            
-            self.device = uinput.Device(events)
+            # Keep the fd so event batches packed into _event_buf go out
+            # with a single os.write()
+            self._uinput_fd = uinput.fdopen()
+            self.device = uinput.Device(events, fd=self._uinput_fd)
             time.sleep(0.1)  # Give kernel time to register device
             logger.info("uinput device created successfully")
             
         except PermissionError:
             logger.error("Permission denied for uinput. Run setup.sh to configure permissions.")
-            logger.info("Falling back to pyautogui")
+            logger.info("Falling back to X11")
             self.use_uinput = False
             self._init_fallback()
         except Exception as e:
             logger.error(f"Failed to create uinput device: {e}")
-            logger.info("Falling back to pyautogui")
+            logger.info("Falling back to X11")
             self.use_uinput = False
             self._init_fallback()
     
-    def _init_fallback(self):
-        """Initialize fallback mode using pyautogui."""
+    def _init_xtest(self) -> bool:
+        """Open the X display for direct XTest pointer events."""
+        x11_path = ctypes.util.find_library('X11')
+        xtst_path = ctypes.util.find_library('Xtst')
+        if not x11_path or not xtst_path:
+            return False
+        
         try:
-            import pyautogui
+            x11 = ctypes.CDLL(x11_path)
+            xtst = ctypes.CDLL(xtst_path)
+            
+            x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+            x11.XOpenDisplay.restype = ctypes.c_void_p
+            x11.XFlush.argtypes = [ctypes.c_void_p]
+            x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+            xtst.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int,
+                                                  ctypes.c_int, ctypes.c_int,
+                                                  ctypes.c_ulong]
+            xtst.XTestFakeButtonEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint,
+                                                  ctypes.c_int, ctypes.c_ulong]
+            
+            display = x11.XOpenDisplay(None)
+            if not display:
+                return False
+        except (OSError, AttributeError) as e:
+            logger.warning(f"XTest unavailable: {e}")
+            return False
+        
+        self._x11 = x11
+        self._xtst = xtst
+        self._xdisplay = display
+        logger.info("Using XTest for mouse control")
+        return True
+    
+    def _init_fallback(self):
+        """Initialize fallback mode using XTest, or pyautogui without it."""
+        # Absolute backends do not know where the cursor starts, so make
+        # sure the first move is never skipped as unchanged
+        self.current_x = -1
+        self.current_y = -1
+        
+        if not self._init_xtest():
+            try:
+                import pyautogui
+            except ImportError:
+                logger.error("Neither uinput, XTest nor pyautogui available - cannot control mouse!")
+                logger.error("Run setup.sh to enable uinput, or install libxtst6")
+                raise RuntimeError("No mouse control method available")
+            
             self.pyautogui = pyautogui
             # Disable failsafe to prevent mouse to corner interruption
             self.pyautogui.FAILSAFE = False
             # Set very fast duration for instant movement
             self.pyautogui.PAUSE = 0
-            logger.info("Using pyautogui for mouse control")
-            
-            # Detect desktop switching tool
-            if self._command_exists('wmctrl'):
-                self.desktop_tool = 'wmctrl'
-                logger.info("Using wmctrl for desktop switching")
-            elif self._command_exists('xdotool'):
-                self.desktop_tool = 'xdotool'
-                logger.info("Using xdotool for desktop switching")
-            else:
-                logger.warning("Neither wmctrl nor xdotool found - desktop switching disabled")
-                logger.info("Install with: sudo apt-get install wmctrl xdotool")
-                
-        except ImportError:
-            logger.error("pyautogui not installed - cannot control mouse!")
-            logger.error("Install with: pip3 install pyautogui")
-            raise RuntimeError("No mouse control method available")
+            logger.warning("XTest unavailable, using slow pyautogui for mouse control; "
+                           "run setup.sh to enable uinput")
+        
+        # Detect desktop switching tool
+        if self._command_exists('wmctrl'):
+            self.desktop_tool = 'wmctrl'
+            logger.info("Using wmctrl for desktop switching")
+        elif self._command_exists('xdotool'):
+            self.desktop_tool = 'xdotool'
+            logger.info("Using xdotool for desktop switching")
+        else:
+            logger.warning("Neither wmctrl nor xdotool found - desktop switching disabled")
+            logger.info("Install with: sudo apt-get install wmctrl xdotool")
     
     def _command_exists(self, cmd: str) -> bool:
         """Check if command exists in PATH."""
-        try:
-            subprocess.run(['which', cmd], capture_output=True, check=True)
-            return True
-        except:
-            return False
+        return shutil.which(cmd) is not None
+    
+    def start(self):
+        """Start the background emitter thread used by the queue_* methods."""
+        if self._emit_running:
+            return
+        self._emit_running = True
+        self._emit_thread = threading.Thread(target=self._emit_loop, name="aerocontrol-hid",
+                                             daemon=True)
+        self._emit_thread.start()
+        logger.info("HID emitter thread started")
+    
+    def stop(self):
+        """Stop the emitter thread after flushing pending events."""
+        if not self._emit_running:
+            return
+        self._emit_running = False
+        self._wake.set()
+        self._emit_thread.join(timeout=2.0)
+        self._emit_thread = None
+        logger.info(f"HID emitter thread stopped: {self.coalesced_moves} moves coalesced")
+    
+    def _emit_loop(self):
+        """Emitter loop: apply the latest cursor target, then queued actions."""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            
+            with self._pending_lock:
+                xy = self._pending_xy
+                self._pending_xy = None
+            if xy is not None:
+                self.move_mouse(xy[0], xy[1])
+            
+            while True:
+                try:
+                    action, args = self._actions.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    action(*args)
+                except Exception as e:
+                    logger.error(f"HID action {action.__name__} failed: {e}")
+            
+            if not self._emit_running:
+                return
+    
+    def _queue_action(self, action, *args):
+        """Run action on the emitter thread, or directly if it is not running."""
+        if not self._emit_running:
+            action(*args)
+            return
+        self._actions.put((action, args))
+        self._wake.set()
+    
+    def queue_move(self, x: int, y: int):
+        """
+        Move the cursor from the emitter thread.
+        
+        Only the newest target is kept: if the thread has not caught up,
+        older pending moves are replaced rather than replayed.
+        
+        Args:
+            x: X coordinate
+            y: Y coordinate
+        """
+        if not self._emit_running:
+            self.move_mouse(x, y)
+            return
+        with self._pending_lock:
+            if self._pending_xy is not None:
+                self.coalesced_moves += 1
+            self._pending_xy = (x, y)
+        self._wake.set()
+    
+    def queue_click(self, button: str = 'left'):
+        """Queue a mouse click (see click)."""
+        self._queue_action(self.click, button)
+    
+    def queue_drag_start(self):
+        """Queue the start of a drag (see drag_start)."""
+        self._queue_action(self.drag_start)
+    
+    def queue_drag_end(self):
+        """Queue the end of a drag (see drag_end)."""
+        self._queue_action(self.drag_end)
+    
+    def queue_scroll(self, amount: int):
+        """Queue a scroll (see scroll)."""
+        self._queue_action(self.scroll, amount)
+    
+    def queue_switch_desktop(self, direction: str):
+        """Queue a desktop switch (see switch_desktop)."""
+        self._queue_action(self.switch_desktop, direction)
+    
+    def _write_events(self, *events: Tuple[Tuple[int, int], int]):
+        """
+        Write (event, value) pairs to the uinput device in a single syscall.
+        
+        Events are packed into a reused buffer, so no per-event bytes
+        objects are allocated.
+        """
+        buf = self._event_buf
+        offset = 0
+        for (ev_type, ev_code), value in events:
+            _INPUT_EVENT.pack_into(buf, offset, 0, 0, ev_type, ev_code, value)
+            offset += _INPUT_EVENT.size
+        os.write(self._uinput_fd, self._event_view[:offset])
+    
+    def _xtest_buttons(self, *events: Tuple[int, bool]):
+        """
+        Send X11 button presses/releases through XTest with one flush.
+        
+        Args:
+            events: (button, is_press) pairs in order
+        """
+        for button, is_press in events:
+            self._xtst.XTestFakeButtonEvent(self._xdisplay, button, is_press, 0)
+        self._x11.XFlush(self._xdisplay)
     
     def move_mouse(self, x: int, y: int):
         """
@@ -134,23 +360,28 @@ class HIDEmitter:
             x: X coordinate
             y: Y coordinate
         """
-        # Clamp to screen bounds
-        x = max(0, min(x, self.screen_width - 1))
-        y = max(0, min(y, self.screen_height - 1))
+        # Clamp to screen bounds and snap to whole pixels
+        x = int(round(max(0, min(x, self.screen_width - 1))))
+        y = int(round(max(0, min(y, self.screen_height - 1))))
+        
+        # Deadband: skip the event when the cursor would not move
+        if x == self.current_x and y == self.current_y:
+            return
         
         if self.use_uinput and self.device:
             try:
-                import uinput
-                
                 # Calculate relative movement from current position
                 delta_x = x - self.current_x
                 delta_y = y - self.current_y
                 
-                # Emit relative mouse movement
-                if delta_x != 0:
-                    self.device.emit(uinput.REL_X, int(delta_x))
-                if delta_y != 0:
-                    self.device.emit(uinput.REL_Y, int(delta_y))
+                # Emit relative mouse movement and SYN_REPORT in one write
+                if delta_x != 0 and delta_y != 0:
+                    self._write_events((self._REL_X, delta_x), (self._REL_Y, delta_y),
+                                       _SYN_REPORT)
+                elif delta_x != 0:
+                    self._write_events((self._REL_X, delta_x), _SYN_REPORT)
+                else:
+                    self._write_events((self._REL_Y, delta_y), _SYN_REPORT)
                 
                 # Update tracked position
                 self.current_x = x
@@ -158,10 +389,18 @@ class HIDEmitter:
                 
             except Exception as e:
                 logger.error(f"uinput move failed: {e}")
+        elif self._xdisplay:
+            # screen -1 = the display's current screen
+            self._xtst.XTestFakeMotionEvent(self._xdisplay, -1, x, y, 0)
+            self._x11.XFlush(self._xdisplay)
+            self.current_x = x
+            self.current_y = y
         else:
             if self.pyautogui:
                 try:
                     self.pyautogui.moveTo(x, y, duration=0)
+                    self.current_x = x
+                    self.current_y = y
                 except Exception as e:
                     logger.error(f"pyautogui move failed: {e}")
     
@@ -174,29 +413,37 @@ class HIDEmitter:
         """
         if self.use_uinput and self.device:
             try:
-                import uinput
-                button_map = {
-                    'left': uinput.BTN_LEFT,
-                    'right': uinput.BTN_RIGHT,
-                    'middle': uinput.BTN_MIDDLE
-                }
-                btn = button_map.get(button, uinput.BTN_LEFT)
+                btn = self._button_map.get(button, self._BTN_LEFT)
                 
-                # Press
-                self.device.emit(btn, 1)
-                time.sleep(0.01)  # Small delay
-                # Release
-                self.device.emit(btn, 0)
+                if self.click_delay > 0:
+                    self._write_events((btn, 1), _SYN_REPORT)
+                    time.sleep(self.click_delay)
+                    self._write_events((btn, 0), _SYN_REPORT)
+                else:
+                    # Press and release as two reports in one write
+                    self._write_events((btn, 1), _SYN_REPORT, (btn, 0), _SYN_REPORT)
                 
-                logger.debug(f"{button} click via uinput")
+                if self._log_debug:
+                    logger.debug(f"{button} click via uinput")
                 
             except Exception as e:
                 logger.error(f"uinput click failed: {e}")
+        elif self._xdisplay:
+            btn = _X_BUTTONS.get(button, 1)
+            if self.click_delay > 0:
+                self._xtest_buttons((btn, True))
+                time.sleep(self.click_delay)
+                self._xtest_buttons((btn, False))
+            else:
+                self._xtest_buttons((btn, True), (btn, False))
+            if self._log_debug:
+                logger.debug(f"{button} click via XTest")
         else:
             if self.pyautogui:
                 try:
                     self.pyautogui.click(button=button)
-                    logger.debug(f"{button} click via pyautogui")
+                    if self._log_debug:
+                        logger.debug(f"{button} click via pyautogui")
                 except Exception as e:
                     logger.error(f"pyautogui click failed: {e}")
     
@@ -204,11 +451,13 @@ class HIDEmitter:
         """Start mouse drag operation."""
         if self.use_uinput and self.device:
             try:
-                import uinput
-                self.device.emit(uinput.BTN_LEFT, 1)
+                self._write_events((self._BTN_LEFT, 1), _SYN_REPORT)
                 logger.debug("Drag started via uinput")
             except Exception as e:
                 logger.error(f"uinput drag_start failed: {e}")
+        elif self._xdisplay:
+            self._xtest_buttons((_X_BUTTONS['left'], True))
+            logger.debug("Drag started via XTest")
         else:
             if self.pyautogui:
                 try:
@@ -221,11 +470,13 @@ class HIDEmitter:
         """End mouse drag operation."""
         if self.use_uinput and self.device:
             try:
-                import uinput
-                self.device.emit(uinput.BTN_LEFT, 0)
+                self._write_events((self._BTN_LEFT, 0), _SYN_REPORT)
                 logger.debug("Drag ended via uinput")
             except Exception as e:
                 logger.error(f"uinput drag_end failed: {e}")
+        elif self._xdisplay:
+            self._xtest_buttons((_X_BUTTONS['left'], False))
+            logger.debug("Drag ended via XTest")
         else:
             if self.pyautogui:
                 try:
@@ -241,21 +492,33 @@ class HIDEmitter:
         Args:
             amount: Scroll amount (positive = up, negative = down)
         """
+        if not self.enable_scroll:
+            return
+        
         if self.use_uinput and self.device:
             try:
-                import uinput
                 # uinput uses negative values for scrolling up
                 scroll_value = -amount if amount > 0 else abs(amount)
-                self.device.emit(uinput.REL_WHEEL, scroll_value)
-                logger.debug(f"Scroll {amount} via uinput")
+                self._write_events((self._REL_WHEEL, scroll_value), _SYN_REPORT)
+                if self._log_debug:
+                    logger.debug(f"Scroll {amount} via uinput")
             except Exception as e:
                 logger.error(f"uinput scroll failed: {e}")
+        elif self._xdisplay:
+            if amount == 0:
+                return
+            # Same 10 wheel clicks per step as the pyautogui fallback
+            btn = _X_WHEEL_UP if amount > 0 else _X_WHEEL_DOWN
+            self._xtest_buttons(*[(btn, True), (btn, False)] * (abs(amount) * 10))
+            if self._log_debug:
+                logger.debug(f"Scroll {amount} via XTest")
         else:
             if self.pyautogui:
                 try:
                     # pyautogui.scroll() takes clicks, multiply for more noticeable effect
                     self.pyautogui.scroll(amount * 10)
-                    logger.debug(f"Scroll {amount} via pyautogui")
+                    if self._log_debug:
+                        logger.debug(f"Scroll {amount} via pyautogui")
                 except Exception as e:
                     logger.error(f"pyautogui scroll failed: {e}")
     
@@ -274,22 +537,19 @@ class HIDEmitter:
         try:
             if self.desktop_tool == 'wmctrl':
                 # Get current desktop
-                result = subprocess.run(['wmctrl', '-d'], capture_output=True, text=True, timeout=2)
+                result = subprocess.run(['wmctrl', '-d'], capture_output=True, timeout=2)
                 
                 if result.returncode != 0:
-                    logger.error(f"wmctrl failed: {result.stderr}")
+                    logger.error(f"wmctrl failed: {result.stderr.decode(errors='replace')}")
                     return
                 
                 current = None
                 total = 0
                 
-                for line in result.stdout.split('\n'):
-                    if line.strip():
-                        parts = line.split()
-                        if len(parts) > 1:
-                            if '*' in parts[1]:
-                                current = int(parts[0])
-                            total += 1
+                for match in _WMCTRL_RE.finditer(result.stdout):
+                    if match.group(2) == b'*':
+                        current = int(match.group(1))
+                    total += 1
                 
                 if current is not None and total > 0:
                     if direction == 'previous':
@@ -318,15 +578,18 @@ class HIDEmitter:
                 
                 current = int(result.stdout.strip())
                 
-                # Get total desktops
-                result = subprocess.run(['xdotool', 'get_num_desktops'], 
-                                      capture_output=True, text=True, timeout=2)
-                
-                if result.returncode != 0:
-                    logger.error(f"xdotool get_num_desktops failed: {result.stderr}")
-                    return
+                # Get total desktops (cached; refreshed if the current desktop is out of range)
+                if self._num_desktops is None or current >= self._num_desktops:
+                    result = subprocess.run(['xdotool', 'get_num_desktops'], 
+                                          capture_output=True, text=True, timeout=2)
+                    
+                    if result.returncode != 0:
+                        logger.error(f"xdotool get_num_desktops failed: {result.stderr}")
+                        return
+                    
+                    self._num_desktops = int(result.stdout.strip())
                 
-                total = int(result.stdout.strip())
+                total = self._num_desktops
                 
                 if direction == 'previous':
                     target = (current - 1) % total
@@ -350,6 +613,8 @@ class HIDEmitter:
     
     def close(self):
         """Clean up resources."""
+        self.stop()
+        
         if self.device:
             try:
                 # uinput devices auto-close when the file descriptor is closed
@@ -358,4 +623,8 @@ class HIDEmitter:
             except:
                 pass
         
+        if self._xdisplay:
+            self._x11.XCloseDisplay(self._xdisplay)
+            self._xdisplay = None
+        
         logger.info("HID emitter closed")
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Optional Numba JIT support.
+Numeric kernels are compiled with numba when it is installed and run as
+plain Python otherwise.
+"""
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+    logger.debug("numba not installed, numeric kernels run as Python")
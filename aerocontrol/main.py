@@ -3,8 +3,8 @@ Main controller for AeroControl.
 Coordinates all components and implements the control loop.
 """
 
+import functools
 import logging
-import time
 import subprocess
 from typing import Optional
 
@@ -12,6 +12,22 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _get_screen_resolution() -> tuple:
+    """Get screen resolution using xrandr (queried once per process)."""
+    try:
+        output = subprocess.check_output(['xrandr']).decode()
+        for line in output.split('\n'):
+            if '*' in line:
+                resolution = line.split()[0]
+                w, h = resolution.split('x')
+                return int(w), int(h)
+    except:
+        logger.warning("Could not detect screen resolution, using default 1920x1080")
+    
+    return 1920, 1080
+
+
 class AeroControl:
     """
     Main controller that coordinates all components.
@@ -30,13 +46,14 @@ class AeroControl:
         from .detector import HandDetector
         from .tracker import HandTracker
         from .gesture import GestureRecognizer
-        from .smoother import AdaptiveSmoother
+        from .smoother import AdaptiveSmoother, _velocity_offset
         from .hidemitter import HIDEmitter
         from .calibrate import Calibrator
         from .ui_debug import DebugUI
+        from .pipeline import DetectionWorker
         
         # Get screen resolution
-        screen_width, screen_height = self._get_screen_resolution()
+        screen_width, screen_height = _get_screen_resolution()
         
         # Initialize components
         cam_config = config.get('camera', {})
@@ -47,48 +64,52 @@ class AeroControl:
             fps=cam_config.get('fps', 30)
         )
         
-        self.detector = HandDetector()
+        self.detector_config = config.get('detector', {})
+        self.detector = HandDetector(draw=debug, **self.detector_config)
+        
+        # Threaded detection stage (capture always runs on its own grabber thread)
+        pipeline_config = config.get('pipeline', {})
+        self.detection_worker = None
+        if pipeline_config.get('threaded', True):
+            self.detection_worker = DetectionWorker(self.camera, self.detector,
+                                                    queue_size=pipeline_config.get('queue_size', 2))
         self.tracker = HandTracker()
         self.gesture = GestureRecognizer(config.get('gestures', {}))
         
         smoother_config = config.get('smoother', {})
         self.smoother = AdaptiveSmoother(**smoother_config)
         
-        self.hid = HIDEmitter(screen_width, screen_height)
+        hid_config = config.get('hid', {})
+        self.hid = HIDEmitter(screen_width, screen_height,
+                              click_delay=hid_config.get('click_delay_ms', 0) / 1000.0,
+                              enable_scroll=hid_config.get('scroll', True))
+        self.hid_threaded = hid_config.get('threaded', True)
         self.calibrator = Calibrator(screen_width, screen_height)
         
+        # The debug window is opened by run(): its display thread must not
+        # drive HighGUI while the calibration wizard uses it on this thread
+        self.debug = debug
         self.debug_ui = DebugUI()
-        if debug:
-            self.debug_ui.enable()
         
         self.velocity_config = config.get('velocity', {})
+        self._velocity_gamma = float(self.velocity_config.get('gamma', 0.6))
+        self._velocity_gain = float(self.velocity_config.get('gain', 0.0025))
+        self._velocity_min = float(self.velocity_config.get('min_velocity', 10))
+        self._velocity_offset = _velocity_offset
+        self._last_screen_pos = None
         self.running = False
         self.is_dragging = False
         self.cursor_paused = False
         
         logger.info("AeroControl initialized")
     
-    def _get_screen_resolution(self) -> tuple:
-        """Get screen resolution using xrandr."""
-        try:
-            output = subprocess.check_output(['xrandr']).decode()
-            for line in output.split('\n'):
-                if '*' in line:
-                    resolution = line.split()[0]
-                    w, h = resolution.split('x')
-                    return int(w), int(h)
-        except:
-            logger.warning("Could not detect screen resolution, using default 1920x1080")
-        
-        return 1920, 1080
-    
     def run_calibration(self) -> bool:
         """Run calibration wizard."""
         if not self.camera.open():
             logger.error("Failed to open camera for calibration")
             return False
         
-        success = self.calibrator.run_wizard(self.camera)
+        success = self.calibrator.run_wizard(self.camera, self.detector_config)
         self.camera.close()
         
         return success
@@ -99,46 +120,86 @@ class AeroControl:
             logger.error("Failed to open camera")
             return
         
+        if self.detection_worker is not None:
+            self.detection_worker.start()
+        if self.hid_threaded:
+            self.hid.start()
+        if self.debug:
+            self.debug_ui.enable()
+        
+        from .gesture import GestureType
+        
+        # Bind hot-loop callables to locals
+        worker = self.detection_worker
+        camera = self.camera
+        camera_read = camera.read
+        get_fps = camera.get_fps
+        detect = self.detector.detect
+        get_hand_scale = self.detector.get_hand_scale
+        track = self.tracker.update
+        get_index_fingertip = self.tracker.get_index_fingertip
+        get_velocity = self.tracker.get_velocity
+        recognize = self.gesture.recognize
+        smooth = self.smoother.smooth
+        map_to_screen = self.calibrator.map_to_screen
+        apply_velocity_control = self._apply_velocity_control
+        hid = self.hid
+        move_mouse = hid.queue_move
+        debug_ui = self.debug_ui
+        
         self.running = True
-        last_time = time.time()
+        last_ns = None
         
         logger.info("AeroControl started - Press Ctrl+C to stop")
         
         while self.running:
-            current_time = time.time()
-            dt = current_time - last_time
-            last_time = current_time
-            
-            # Read frame
-            ret, frame = self.camera.read()
-            if not ret:
-                logger.warning("Failed to read frame")
-                continue
+            if worker is not None:
+                # Frame and hands detected on the worker thread
+                ret, frame, hands_data = worker.read()
+                if not ret:
+                    logger.warning("Failed to read frame")
+                    continue
+                frame_ns = worker.last_frame_time
+            else:
+                # Read frame
+                ret, frame = camera_read()
+                if not ret:
+                    logger.warning("Failed to read frame")
+                    continue
+                frame_ns = camera.last_frame_time
+                
+                # Detect hands
+                hands_data = detect(frame)
             
-            # Detect hands
-            hands_data = self.detector.detect(frame)
+            # Time between frame grabs, so motion is measured against when
+            # the frames were captured rather than when they were processed
+            dt = 0.0 if last_ns is None else (frame_ns - last_ns) * 1e-9
+            last_ns = frame_ns
             
             # Track primary hand
-            primary_hand = self.tracker.update(hands_data)
+            primary_hand = track(hands_data)
             
             if primary_hand is None:
-                if self.debug_ui.enabled:
+                # Restart the velocity direction when the hand comes back,
+                # rather than measuring from where it was lost
+                self._last_screen_pos = None
+                if debug_ui.should_draw():
                     self._update_debug_ui(frame, {})
                 continue
             
             # Get hand scale for adaptive smoothing
-            hand_scale = self.detector.get_hand_scale(primary_hand['landmarks'])
+            hand_scale = get_hand_scale(primary_hand['landmarks'])
             
             # Recognize gesture
-            from .gesture import GestureType
-            gesture_type, gesture_data = self.gesture.recognize(primary_hand, dt)
+            gesture_type, gesture_data = recognize(primary_hand, dt)
             
             # Handle palm open (pause)
             if gesture_type == GestureType.PALM_OPEN:
                 self.cursor_paused = True
-                if self.debug_ui.enabled:
+                self._last_screen_pos = None
+                if debug_ui.should_draw():
                     self._update_debug_ui(frame, {
-                        'fps': self.camera.get_fps(),
+                        'fps': get_fps(),
                         'gesture': 'PAUSED',
                         'hand_scale': hand_scale
                     })
@@ -148,53 +209,53 @@ class AeroControl:
             
             # Handle desktop switching gestures
             if gesture_type == GestureType.SWIPE_UP:
-                self.hid.switch_desktop('previous')
+                hid.queue_switch_desktop('previous')
                 continue
             elif gesture_type == GestureType.SWIPE_DOWN:
-                self.hid.switch_desktop('next')
+                hid.queue_switch_desktop('next')
                 continue
             
             # Get index fingertip position
-            index_tip_cam = self.tracker.get_index_fingertip(primary_hand)
+            index_tip_cam = get_index_fingertip(primary_hand)
             
             # Apply smoothing
-            smoothed_cam = self.smoother.smooth(index_tip_cam, hand_scale)
+            smoothed_cam = smooth(index_tip_cam, hand_scale)
             
             # Map to screen coordinates
-            screen_pos = self.calibrator.map_to_screen(smoothed_cam)
+            screen_pos = map_to_screen(smoothed_cam)
             
             # Apply velocity-based control
-            velocity = self.tracker.get_velocity(index_tip_cam, dt)
-            adjusted_pos = self._apply_velocity_control(screen_pos, velocity)
+            velocity = get_velocity(index_tip_cam, dt)
+            adjusted_pos = apply_velocity_control(screen_pos, velocity)
             
             # Move cursor
             if not self.cursor_paused:
-                self.hid.move_mouse(adjusted_pos[0], adjusted_pos[1])
+                move_mouse(adjusted_pos[0], adjusted_pos[1])
             
             # Handle click gestures
             if gesture_type == GestureType.PINCH:
                 if not self.is_dragging:
-                    self.hid.click('left')
+                    hid.queue_click('left')
             elif gesture_type == GestureType.RIGHT_CLICK:
-                self.hid.click('right')
+                hid.queue_click('right')
             elif gesture_type == GestureType.DRAG:
                 if not self.is_dragging:
-                    self.hid.drag_start()
+                    hid.queue_drag_start()
                     self.is_dragging = True
             elif gesture_type == GestureType.ZOOM:
                 spread = gesture_data.get('spread', 0)
                 scroll_amount = int((spread - 200) / 50)
-                self.hid.scroll(scroll_amount)
+                hid.queue_scroll(scroll_amount)
             else:
                 if self.is_dragging:
-                    self.hid.drag_end()
+                    hid.queue_drag_end()
                     self.is_dragging = False
             
             # Update debug UI
-            if self.debug_ui.enabled:
+            if debug_ui.should_draw():
                 frame = self.detector.draw_landmarks(frame, [primary_hand])
                 self._update_debug_ui(frame, {
-                    'fps': self.camera.get_fps(),
+                    'fps': get_fps(),
                     'gesture': gesture_type.name,
                     'alpha': self.smoother.get_current_alpha(),
                     'hand_scale': hand_scale,
@@ -208,29 +269,31 @@ class AeroControl:
         """
         Apply velocity-based sensitivity curve.
         
-        Formula: adjusted = pos + sign(v) * (|v| ** gamma) * gain
+        Formula: adjusted = pos + direction * (|v| ** gamma) * gain
+        where direction is the unit vector of cursor motion since the last frame.
         """
-        gamma = self.velocity_config.get('gamma', 0.6)
-        gain = self.velocity_config.get('gain', 0.0025)
-        min_vel = self.velocity_config.get('min_velocity', 10)
-        
-        if velocity < min_vel:
+        last = self._last_screen_pos
+        self._last_screen_pos = position
+        if last is None:
             return position
         
-        # Apply power curve
-        adjustment = (velocity ** gamma) * gain
+        off_x, off_y = self._velocity_offset(
+            float(position[0] - last[0]), float(position[1] - last[1]), float(velocity),
+            self._velocity_gamma, self._velocity_gain, self._velocity_min)
         
-        # For now, just return original position
-        # In production, would calculate direction and apply adjustment
-        return position
+        return (int(round(position[0] + off_x)), int(round(position[1] + off_y)))
     
     def _update_debug_ui(self, frame, info: dict):
         """Update debug UI with current info."""
-        self.debug_ui.draw(frame, info)
+        # Each loop iteration gets a fresh frame and drops it after this,
+        # so the overlay is drawn onto it directly
+        self.debug_ui.draw(frame, info, inplace=True)
     
     def stop(self):
         """Stop AeroControl."""
         self.running = False
+        if self.detection_worker is not None:
+            self.detection_worker.stop()
         self.camera.close()
         self.detector.close()
         self.hid.close()
@@ -0,0 +1,118 @@
+"""
+Threaded pipeline stages for AeroControl.
+Overlaps camera capture and hand detection so neither blocks the other.
+"""
+
+import logging
+import queue
+import threading
+from typing import Optional, List, Tuple
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+def put_latest(q: queue.Queue, item) -> bool:
+    """
+    Put item into a bounded queue, dropping the oldest entry if full.
+
+    Args:
+        q: Bounded queue
+        item: Item to enqueue
+
+    Returns:
+        True if an older item was dropped
+    """
+    dropped = False
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped = True
+            except queue.Empty:
+                pass
+
+
+class DetectionWorker:
+    """
+    Runs hand detection on a background thread.
+    Pulls frames from a CameraCapture and publishes detection results.
+    """
+
+    def __init__(self, camera, detector, queue_size: int = 2):
+        """
+        Initialize detection worker.
+
+        Args:
+            camera: Opened CameraCapture instance
+            detector: HandDetector instance, used only by the worker thread
+            queue_size: Maximum number of pending results
+        """
+        self.camera = camera
+        self.detector = detector
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Grab timestamp (monotonic_ns) of the frame last returned by read()
+        self.last_frame_time = 0
+
+        # Diagnostics
+        self.processed_frames = 0
+        self.dropped_results = 0
+
+    def start(self):
+        """Start the detection thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="aerocontrol-detect",
+                                        daemon=True)
+        self._thread.start()
+        logger.info("Detection worker started")
+
+    def _run(self):
+        """Worker loop: read frame, detect hands, publish result."""
+        while self._running:
+            ret, frame = self.camera.read()
+            if not ret:
+                continue
+
+            frame_time = self.camera.last_frame_time
+            hands_data = self.detector.detect(frame)
+            self.processed_frames += 1
+
+            if put_latest(self._queue, (frame_time, frame, hands_data)):
+                self.dropped_results += 1
+
+    def read(self, timeout: float = 1.0) -> Tuple[bool, Optional[np.ndarray], Optional[List[dict]]]:
+        """
+        Get the next detection result.
+
+        Args:
+            timeout: Seconds to wait for a result
+
+        Returns:
+            Tuple of (success, frame, hands_data)
+        """
+        try:
+            frame_time, frame, hands_data = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return False, None, None
+        self.last_frame_time = frame_time
+        return True, frame, hands_data
+
+    def stop(self):
+        """Stop the detection thread."""
+        if not self._running:
+            return
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        logger.info(f"Detection worker stopped: {self.processed_frames} frames processed, "
+                    f"{self.dropped_results} results dropped")
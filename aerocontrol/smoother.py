@@ -1,10 +1,97 @@
-import numpy as np
 import logging
+import math
+import time
 from typing import Tuple, Optional
 
+from .jit import njit
+
 
 logger = logging.getLogger(__name__)
 
+# Initial Kalman state and covariance upper triangle (identity)
+_KALMAN_ZERO_STATE = (0.0, 0.0, 0.0, 0.0)
+_KALMAN_INIT_COV = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 0.0, 1.0)
+
+# Fixed-point format of the EMA state (q16.16: 1/65536 pixel resolution)
+_Q_SHIFT = 16
+_Q_ONE = 1 << _Q_SHIFT
+_Q_HALF = 1 << (_Q_SHIFT - 1)
+
+
+def _warm_up(name: str, kernel, *args):
+    """
+    Compile (or load the cached) kernel now rather than on the first frame.
+    
+    Args:
+        name: Kernel name for the debug log
+        kernel: njit kernel to call once
+        args: Arguments of the types used at runtime
+    """
+    start = time.perf_counter()
+    kernel(*args)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"{name} kernel ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+@njit(cache=True, fastmath=True)
+def _ema_step(x, y, sx, sy, hand_scale, alpha_base, alpha_min, alpha_max,
+              adaptation_factor, reference_hand_size):
+    """
+    One adaptive EMA update.
+    
+    Args:
+        x, y: New position in pixels
+        sx, sy: Smoothed position in q16.16
+        hand_scale: Current hand scale (pixels)
+        
+    Returns:
+        Tuple of (sx, sy, alpha)
+    """
+    # Calculate adaptive alpha based on hand scale
+    # When hand is far (small scale), use higher alpha (less smoothing, more responsive)
+    # When hand is near (large scale), use lower alpha (more smoothing, more stable)
+    scale_ratio = reference_hand_size / max(hand_scale, 1.0)
+    scale_factor = 1.0 - scale_ratio  # Negative when hand is far, positive when near
+    
+    alpha = alpha_base * (1.0 + adaptation_factor * scale_factor)
+    alpha = max(alpha_min, min(alpha_max, alpha))
+    
+    # Apply EMA smoothing in fixed point (rounded, so no drift accumulates)
+    alpha_q = int(alpha * _Q_ONE)
+    beta_q = _Q_ONE - alpha_q
+    sx = (alpha_q * int(round(x * _Q_ONE)) + beta_q * sx + _Q_HALF) >> _Q_SHIFT
+    sy = (alpha_q * int(round(y * _Q_ONE)) + beta_q * sy + _Q_HALF) >> _Q_SHIFT
+    
+    return sx, sy, alpha
+
+
+@njit(cache=True, fastmath=True)
+def _velocity_offset(dx, dy, velocity, gamma, gain, min_velocity):
+    """
+    Velocity-based cursor offset along the direction of motion.
+    
+    Formula: offset = unit(dx, dy) * (|v| ** gamma) * gain
+    
+    Args:
+        dx, dy: Cursor displacement since the last frame
+        velocity: Hand speed (pixels per second)
+        gamma: Power curve exponent
+        gain: Gain factor
+        min_velocity: Speed below which no offset is applied
+        
+    Returns:
+        (x, y) offset in pixels
+    """
+    if velocity < min_velocity:
+        return 0.0, 0.0
+    
+    distance = math.sqrt(dx * dx + dy * dy)
+    if distance == 0.0:
+        return 0.0, 0.0
+    
+    scale = (velocity ** gamma) * gain / distance
+    return dx * scale, dy * scale
+
 
 class AdaptiveSmoother:
     """
@@ -14,7 +101,7 @@ class AdaptiveSmoother:
     
     def __init__(self, alpha_base: float = 0.3, alpha_min: float = 0.1,
                  alpha_max: float = 0.7, adaptation_factor: float = 0.5,
-                 reference_hand_size: float = 150.0):
+                 reference_hand_size: float = 150.0, epsilon: float = 0.0):
         """
         Initialize adaptive smoother.
         
@@ -24,19 +111,36 @@ class AdaptiveSmoother:
             alpha_max: Maximum alpha value
             adaptation_factor: How strongly distance affects smoothing
             reference_hand_size: Reference hand size in pixels for normalization
+            epsilon: Movement (pixels, per axis) below which the previous
+                smoothed position is returned unchanged; 0 disables the check
         """
-        self.alpha_base = alpha_base
-        self.alpha_min = alpha_min
-        self.alpha_max = alpha_max
-        self.adaptation_factor = adaptation_factor
-        self.reference_hand_size = reference_hand_size
+        self.alpha_base = float(alpha_base)
+        self.alpha_min = float(alpha_min)
+        self.alpha_max = float(alpha_max)
+        self.adaptation_factor = float(adaptation_factor)
+        self.reference_hand_size = float(reference_hand_size)
+        self.epsilon = float(epsilon)
         
-        self.smoothed_pos: Optional[np.ndarray] = None
+        # Smoothed position as q16.16 fixed-point integers
+        self._sx = 0
+        self._sy = 0
+        self._initialized = False
         self.current_alpha = alpha_base
         
+        _warm_up("EMA", _ema_step, 0.0, 0.0, 0, 0, 1.0, 0.5, 0.0, 1.0, 0.0, 1.0)
+        # The controller applies the velocity curve to this smoother's output
+        _warm_up("Velocity", _velocity_offset, 1.0, 0.0, 20.0, 0.6, 1.0, 10.0)
+        
         logger.info(f"Smoother initialized: alpha={alpha_base}, "
                    f"range=[{alpha_min}, {alpha_max}]")
     
+    @property
+    def smoothed_pos(self) -> Optional[Tuple[float, float]]:
+        """Current smoothed position, or None before the first sample."""
+        if not self._initialized:
+            return None
+        return (self._sx / _Q_ONE, self._sy / _Q_ONE)
+    
     def smooth(self, position: Tuple[float, float], hand_scale: float) -> Tuple[float, float]:
         """
         Apply adaptive smoothing to position.
@@ -52,27 +156,27 @@ class AdaptiveSmoother:
         Returns:
             Smoothed (x, y) position
         """
-        pos_array = np.array(position, dtype=np.float32)
-        
         # Initialize on first call
-        if self.smoothed_pos is None:
-            self.smoothed_pos = pos_array
-            return tuple(self.smoothed_pos)
+        if not self._initialized:
+            self._sx = int(round(position[0] * _Q_ONE))
+            self._sy = int(round(position[1] * _Q_ONE))
+            self._initialized = True
+            return (self._sx / _Q_ONE, self._sy / _Q_ONE)
         
-        # Calculate adaptive alpha based on hand scale
-        # When hand is far (small scale), use higher alpha (less smoothing, more responsive)
-        # When hand is near (large scale), use lower alpha (more smoothing, more stable)
-        scale_ratio = self.reference_hand_size / max(hand_scale, 1.0)
-        scale_factor = 1.0 - scale_ratio  # Negative when hand is far, positive when near
+        x = float(position[0])
+        y = float(position[1])
+        smoothed = (self._sx / _Q_ONE, self._sy / _Q_ONE)
         
-        self.current_alpha = self.alpha_base * (1.0 + self.adaptation_factor * scale_factor)
-        self.current_alpha = np.clip(self.current_alpha, self.alpha_min, self.alpha_max)
+        # A resting hand keeps the exact same smoothed position
+        if abs(x - smoothed[0]) < self.epsilon and abs(y - smoothed[1]) < self.epsilon:
+            return smoothed
         
-        # Apply EMA smoothing
-        self.smoothed_pos = (self.current_alpha * pos_array + 
-                            (1.0 - self.current_alpha) * self.smoothed_pos)
+        self._sx, self._sy, self.current_alpha = _ema_step(
+            x, y, self._sx, self._sy, float(hand_scale),
+            self.alpha_base, self.alpha_min, self.alpha_max,
+            self.adaptation_factor, self.reference_hand_size)
         
-        return tuple(self.smoothed_pos)
+        return (self._sx / _Q_ONE, self._sy / _Q_ONE)
     
     def get_current_alpha(self) -> float:
         """Get current smoothing factor."""
@@ -80,10 +184,86 @@ class AdaptiveSmoother:
     
     def reset(self):
         """Reset smoother state."""
-        self.smoothed_pos = None
+        self._initialized = False
         self.current_alpha = self.alpha_base
 
 
+@njit(cache=True)
+def _kalman_step(state, p, zx, zy, q, r):
+    """
+    One predict/update step of the constant-velocity Kalman filter.
+    
+    The model is fixed (4-d state, unit time step, position-only measurement),
+    so the matrix products are unrolled to scalar math.
+    
+    Args:
+        state: (x, y, vx, vy)
+        p: Upper triangle of the symmetric covariance
+           (p00, p01, p02, p03, p11, p12, p13, p22, p23, p33)
+        zx, zy: Measured position
+        q: Process noise
+        r: Measurement noise
+        
+    Returns:
+        Tuple of (state, p) after the update
+    """
+    x, y, vx, vy = state
+    p00, p01, p02, p03, p11, p12, p13, p22, p23, p33 = p
+    
+    # Prediction: x' = F x, P' = F P F^T + Q
+    x += vx
+    y += vy
+    p00 = p00 + 2.0 * p02 + p22 + q
+    p01 = p01 + p03 + p12 + p23
+    p02 = p02 + p22
+    p03 = p03 + p23
+    p11 = p11 + 2.0 * p13 + p33 + q
+    p12 = p12 + p23
+    p13 = p13 + p33
+    p22 = p22 + q
+    p33 = p33 + q
+    
+    # Innovation covariance S = H P H^T + R and its inverse
+    s00 = p00 + r
+    s11 = p11 + r
+    det = s00 * s11 - p01 * p01
+    i00 = s11 / det
+    i01 = -p01 / det
+    i11 = s00 / det
+    
+    # Kalman gain K = P H^T S^-1 (rows: x, y, vx, vy)
+    k00 = p00 * i00 + p01 * i01
+    k01 = p00 * i01 + p01 * i11
+    k10 = p01 * i00 + p11 * i01
+    k11 = p01 * i01 + p11 * i11
+    k20 = p02 * i00 + p12 * i01
+    k21 = p02 * i01 + p12 * i11
+    k30 = p03 * i00 + p13 * i01
+    k31 = p03 * i01 + p13 * i11
+    
+    # State update
+    ex = zx - x
+    ey = zy - y
+    x += k00 * ex + k01 * ey
+    y += k10 * ex + k11 * ey
+    vx += k20 * ex + k21 * ey
+    vy += k30 * ex + k31 * ey
+    
+    # Covariance update P = (I - K H) P
+    n00 = p00 - k00 * p00 - k01 * p01
+    n01 = p01 - k00 * p01 - k01 * p11
+    n02 = p02 - k00 * p02 - k01 * p12
+    n03 = p03 - k00 * p03 - k01 * p13
+    n11 = p11 - k10 * p01 - k11 * p11
+    n12 = p12 - k10 * p02 - k11 * p12
+    n13 = p13 - k10 * p03 - k11 * p13
+    n22 = p22 - k20 * p02 - k21 * p12
+    n23 = p23 - k20 * p03 - k21 * p13
+    n33 = p33 - k30 * p03 - k31 * p13
+    
+    return (x, y, vx, vy), (n00, n01, n02, n03, n11, n12, n13, n22, n23, n33)
+
+
 class KalmanSmoother:
     """
     Kalman filter for advanced smoothing (optional alternative to EMA).
@@ -97,13 +277,17 @@ class KalmanSmoother:
             process_noise: Process noise covariance
             measurement_noise: Measurement noise covariance
         """
-        self.process_noise = process_noise
-        self.measurement_noise = measurement_noise
+        self.process_noise = float(process_noise)
+        self.measurement_noise = float(measurement_noise)
         
-        # State: [x, y, vx, vy]
+        # State: (x, y, vx, vy)
         self.state = None
+        # Upper triangle of the symmetric 4x4 covariance
         self.covariance = None
         
+        _warm_up("Kalman", _kalman_step, _KALMAN_ZERO_STATE, _KALMAN_INIT_COV, 0.0, 0.0,
+                 self.process_noise, self.measurement_noise)
+        
     def smooth(self, measurement: Tuple[float, float]) -> Tuple[float, float]:
         """
         Apply Kalman filtering.
@@ -114,41 +298,19 @@ class KalmanSmoother:
         Returns:
             Filtered (x, y) position
         """
-        z = np.array([[measurement[0]], [measurement[1]]])
-        
         if self.state is None:
             # Initialize state
-            self.state = np.array([[measurement[0]], [measurement[1]], [0.0], [0.0]])
-            self.covariance = np.eye(4) * 1.0
+            self.state = (float(measurement[0]), float(measurement[1]), 0.0, 0.0)
+            self.covariance = _KALMAN_INIT_COV
             return measurement
         
-        # Prediction step
-        F = np.array([[1, 0, 1, 0],
-                     [0, 1, 0, 1],
-                     [0, 0, 1, 0],
-                     [0, 0, 0, 1]])
-        
-        Q = np.eye(4) * self.process_noise
+        self.state, self.covariance = _kalman_step(
+            self.state, self.covariance, float(measurement[0]), float(measurement[1]),
+            self.process_noise, self.measurement_noise)
         
-        self.state = F @ self.state
-        self.covariance = F @ self.covariance @ F.T + Q
-        
-        # Update step
-        H = np.array([[1, 0, 0, 0],
-                     [0, 1, 0, 0]])
-        
-        R = np.eye(2) * self.measurement_noise
-        
-        y = z - H @ self.state
-        S = H @ self.covariance @ H.T + R
-        K = self.covariance @ H.T @ np.linalg.inv(S)
-        
-        self.state = self.state + K @ y
-        self.covariance = (np.eye(4) - K @ H) @ self.covariance
-        
-        return (float(self.state[0, 0]), float(self.state[1, 0]))
+        return (self.state[0], self.state[1])
     
     def reset(self):
         """Reset filter state."""
         self.state = None
-        self.covariance = None
\ No newline at end of file
+        self.covariance = None
@@ -1,6 +1,6 @@
 import logging
+import math
 from typing import Optional, List
-import numpy as np
 
 
 logger = logging.getLogger(__name__)
@@ -24,6 +24,7 @@ class HandTracker:
         self.candidate_hand_id = None
         self.candidate_count = 0
         self.last_position = None
+        self._log_debug = logger.isEnabledFor(logging.DEBUG)
     
     def update(self, hands_data: Optional[List[dict]]) -> Optional[dict]:
         """
@@ -37,7 +38,7 @@ class HandTracker:
         """
         if not hands_data:
             # No hands detected
-            if self.primary_hand_id is not None:
+            if self._log_debug and self.primary_hand_id is not None:
                 logger.debug("Lost primary hand")
             self.primary_hand_id = None
             self.candidate_hand_id = None
@@ -47,49 +48,49 @@ class HandTracker:
         # For simplicity, use the first detected hand as primary
         # In production, could use handedness preference or position tracking
         current_hand = hands_data[0]
-        current_id = id(current_hand)
+        # Detector hands carry a per-track uid; fall back to the handedness
+        # label for hand data built elsewhere
+        current_id = current_hand.get('uid', current_hand.get('handedness'))
         
         if self.primary_hand_id is None:
             # No primary hand, establish one immediately
             self.primary_hand_id = current_id
-            logger.debug("Primary hand established")
+            if self._log_debug:
+                logger.debug("Primary hand established")
             return current_hand
         
-        # Check if same hand is still present
-        if current_id == self.primary_hand_id:
-            self.candidate_count = 0
-            return current_hand
+        # A different hand must be seen for several frames before switching:
+        # the count resets for the primary hand, grows for a repeated
+        # candidate and restarts at 1 for a new one
+        same = current_id == self.primary_hand_id
+        candidate_same = current_id == self.candidate_hand_id
+        count = (self.candidate_count * candidate_same + 1) * (not same)
         
-        # Different hand detected - require stability before switching
-        if current_id == self.candidate_hand_id:
-            self.candidate_count += 1
-            if self.candidate_count >= self.stability_frames:
+        if candidate_same and count >= self.stability_frames:
+            if self._log_debug:
                 logger.debug("Switched to new primary hand")
-                self.primary_hand_id = current_id
-                self.candidate_hand_id = None
-                self.candidate_count = 0
-                return current_hand
-        else:
+            self.primary_hand_id = current_id
+            self.candidate_hand_id = None
+            count = 0
+        elif not same:
             self.candidate_hand_id = current_id
-            self.candidate_count = 1
+        self.candidate_count = count
         
-        # Return current primary hand data (find it in hands_data)
-        # For simplicity, return first hand
-        return hands_data[0]
+        return current_hand
     
     def get_index_fingertip(self, hand_data: dict) -> tuple:
         """
         Get index fingertip position.
         
         Args:
-            hand_data: Hand data dictionary
+            hand_data: Hand data dictionary with a (21, 3) landmark array
             
         Returns:
             (x, y) coordinates
         """
         # Index finger tip is landmark 8
-        index_tip = hand_data['landmarks'][8]
-        return (index_tip['x'], index_tip['y'])
+        x, y = hand_data['landmarks'][8, :2].tolist()
+        return (x, y)
     
     def get_velocity(self, current_pos: tuple, dt: float) -> float:
         """
@@ -102,15 +103,9 @@ class HandTracker:
         Returns:
             Velocity in pixels per second
         """
-        if self.last_position is None or dt <= 0:
-            self.last_position = current_pos
-            return 0.0
-        
-        dx = current_pos[0] - self.last_position[0]
-        dy = current_pos[1] - self.last_position[1]
-        distance = np.sqrt(dx**2 + dy**2)
-        
-        velocity = distance / dt
+        last = self.last_position
         self.last_position = current_pos
+        if dt <= 0 or last is None:
+            return 0.0
         
-        return velocity
\ No newline at end of file
+        return math.hypot(current_pos[0] - last[0], current_pos[1] - last[1]) / dt
\ No newline at end of file
@@ -5,6 +5,8 @@ Displays real-time visualization of hand tracking and gestures.
 
 import cv2
 import logging
+import queue
+import threading
 import numpy as np
 from typing import Optional
 
@@ -12,67 +14,218 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 
 
+# Info panel layout
+_PANEL_TOP_LEFT = (10, 10)
+_PANEL_BOTTOM = 200
+_PANEL_COLOR = (0, 255, 0)
+_TEXT_X = 20
+_TEXT_Y = 40
+_LINE_HEIGHT = 30
+_LABELS = ("FPS: ", "Gesture: ", "Smoothing: ", "Hand Scale: ", "Cursor: ")
+_NUM_LINES = len(_LABELS)
+
+# Display buffers: one being drawn, one queued, one on screen
+_NUM_BUFFERS = 3
+
+
 class DebugUI:
     """
     Debug overlay window showing tracking status.
     """
     
-    def __init__(self, window_name: str = "AeroControl Debug"):
+    def __init__(self, window_name: str = "AeroControl Debug", draw_every: int = 2):
         """
         Initialize debug UI.
         
         Args:
             window_name: Name of the OpenCV window
+            draw_every: Render every Nth frame (see should_draw)
         """
         self.window_name = window_name
         self.enabled = False
+        self._every = max(1, draw_every)
+        self._frame_count = 0
+        
+        # Rendered frames go to the display thread through a single slot as
+        # (frame, pooled); pooled buffers come back through the free queue
+        # once shown
+        self._frames: queue.Queue = queue.Queue(maxsize=1)
+        self._free: queue.Queue = queue.Queue()
+        for _ in range(_NUM_BUFFERS):
+            self._free.put(np.empty(0, dtype=np.uint8))
+        self._show_thread: Optional[threading.Thread] = None
+        self._frame_shape = None
+        
+        # Pre-rendered info panel: background with labels, current panel with
+        # values, mask of the pixels it covers and where it sits in the frame.
+        # Each line's row strip and value origin are in panel coordinates.
+        self._panel_base: Optional[np.ndarray] = None
+        self._panel: Optional[np.ndarray] = None
+        self._panel_mask: Optional[np.ndarray] = None
+        self._panel_roi = (slice(0), slice(0))
+        self._line_strips = [slice(0)] * _NUM_LINES
+        self._value_origins = [(0, 0)] * _NUM_LINES
+        self._last_text = [None] * _NUM_LINES
     
     def enable(self):
-        """Enable debug UI."""
+        """Enable debug UI and start the display thread."""
+        if self.enabled:
+            return
         self.enabled = True
-        cv2.namedWindow(self.window_name)
+        self._show_thread = threading.Thread(target=self._show_loop, name="aerocontrol-debug-ui",
+                                             daemon=True)
+        self._show_thread.start()
         logger.info("Debug UI enabled")
     
     def disable(self):
-        """Disable debug UI."""
+        """Disable debug UI and close the window."""
         if self.enabled:
-            cv2.destroyWindow(self.window_name)
             self.enabled = False
+            if self._show_thread is not None:
+                self._show_thread.join(timeout=2.0)
+                self._show_thread = None
             logger.info("Debug UI disabled")
     
-    def draw(self, frame: np.ndarray, info: dict):
+    def should_draw(self) -> bool:
+        """
+        Count a frame and report whether it is one to render.
+        
+        Called once per frame; the caller skips all overlay work, including
+        landmark drawing, on frames for which it returns False.
+        
+        Returns:
+            True if the UI is enabled and this is every draw_every-th frame
+        """
+        if not self.enabled:
+            return False
+        self._frame_count += 1
+        return self._frame_count % self._every == 0
+    
+    def _show_loop(self):
+        """Display thread: show rendered frames and pump window events."""
+        # OpenGL windows upload frames as textures; most pip builds of
+        # OpenCV lack GL support, in which case the plain window is used
+        try:
+            cv2.namedWindow(self.window_name, cv2.WINDOW_OPENGL | cv2.WINDOW_AUTOSIZE)
+            logger.debug("Debug UI using OpenGL window")
+        except cv2.error:
+            cv2.namedWindow(self.window_name)
+        
+        while self.enabled:
+            try:
+                display_frame, pooled = self._frames.get(timeout=0.05)
+            except queue.Empty:
+                cv2.waitKey(1)
+                continue
+            cv2.imshow(self.window_name, display_frame)
+            cv2.waitKey(1)
+            if pooled:
+                self._free.put(display_frame)
+        cv2.destroyWindow(self.window_name)
+    
+    def _build_panel(self, height: int, width: int):
+        """
+        Render the static info panel background and labels for a frame size.
+        
+        Args:
+            height: Frame height in pixels
+            width: Frame width in pixels
+        """
+        bottom_right = (width - 10, _PANEL_BOTTOM)
+        rows = min(height, _PANEL_BOTTOM + 2)
+        
+        mask = np.zeros((rows, width), dtype=np.uint8)
+        cv2.rectangle(mask, _PANEL_TOP_LEFT, bottom_right, 255, -1)
+        cv2.rectangle(mask, _PANEL_TOP_LEFT, bottom_right, 255, 2)
+        
+        panel = np.zeros((rows, width, 3), dtype=np.uint8)
+        cv2.rectangle(panel, _PANEL_TOP_LEFT, bottom_right, (0, 0, 0), -1)
+        cv2.rectangle(panel, _PANEL_TOP_LEFT, bottom_right, _PANEL_COLOR, 2)
+        
+        # Crop to the bounding box of the drawn pixels
+        rows, cols = np.nonzero(mask)
+        y0, y1 = int(rows.min()), int(rows.max()) + 1
+        x0, x1 = int(cols.min()), int(cols.max()) + 1
+        
+        # Labels never change; per frame only the values after them are drawn.
+        # getTextSize reports one pixel past where putText continues the line.
+        for i, label in enumerate(_LABELS):
+            baseline = _TEXT_Y + i * _LINE_HEIGHT
+            cv2.putText(panel, label, (_TEXT_X, baseline),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, _PANEL_COLOR, 2)
+            (label_width, _), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            
+            self._line_strips[i] = slice(baseline - 22 - y0, baseline + 8 - y0)
+            self._value_origins[i] = (_TEXT_X + label_width - 1 - x0, baseline - y0)
+        
+        self._panel_roi = (slice(y0, y1), slice(x0, x1))
+        self._panel_mask = mask[y0:y1, x0:x1].copy()
+        self._panel_base = panel[y0:y1, x0:x1].copy()
+        self._panel = self._panel_base.copy()
+        self._last_text = [None] * _NUM_LINES
+    
+    def _update_panel(self, values: list):
+        """
+        Re-render only the panel values whose text changed.
+        
+        Args:
+            values: Value text for each panel line
+        """
+        last_text = self._last_text
+        for i, text in enumerate(values):
+            if text == last_text[i]:
+                continue
+            last_text[i] = text
+            
+            # Clear this line's strip back to the background and label
+            strip = self._line_strips[i]
+            self._panel[strip] = self._panel_base[strip]
+            cv2.putText(self._panel, text, self._value_origins[i],
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, _PANEL_COLOR, 2)
+    
+    def draw(self, frame: np.ndarray, info: dict, inplace: bool = True):
         """
         Draw debug information on frame.
         
+        Only frames for which should_draw() returned True are passed in.
+        
         Args:
             frame: Camera frame
             info: Dictionary with debug information
+            inplace: Draw onto frame itself and hand it to the display thread;
+                the caller must not use the frame afterwards. Otherwise the
+                frame is copied into a reused display buffer.
         """
         if not self.enabled:
             return
         
-        display_frame = frame.copy()
-        h, w = display_frame.shape[:2]
-        
-        # Draw info panel background
-        cv2.rectangle(display_frame, (10, 10), (w - 10, 200), (0, 0, 0), -1)
-        cv2.rectangle(display_frame, (10, 10), (w - 10, 200), (0, 255, 0), 2)
+        if inplace:
+            display_frame = frame
+        else:
+            # Every buffer in flight means the window is behind; skip this frame
+            try:
+                display_frame = self._free.get_nowait()
+            except queue.Empty:
+                return
+            if display_frame.shape != frame.shape:
+                display_frame = np.empty_like(frame)
+            np.copyto(display_frame, frame)
         
-        # Draw text information
-        y_offset = 40
-        line_height = 30
+        if frame.shape != self._frame_shape:
+            self._frame_shape = frame.shape
+            self._build_panel(frame.shape[0], frame.shape[1])
         
-        texts = [
-            f"FPS: {info.get('fps', 0):.1f}",
-            f"Gesture: {info.get('gesture', 'None')}",
-            f"Smoothing: {info.get('alpha', 0):.3f}",
-            f"Hand Scale: {info.get('hand_scale', 0):.1f}",
-            f"Cursor: ({info.get('cursor_x', 0)}, {info.get('cursor_y', 0)})",
+        values = [
+            f"{info.get('fps', 0):.1f}",
+            f"{info.get('gesture', 'None')}",
+            f"{info.get('alpha', 0):.3f}",
+            f"{info.get('hand_scale', 0):.1f}",
+            f"({info.get('cursor_x', 0)}, {info.get('cursor_y', 0)})",
         ]
+        self._update_panel(values)
         
-        for i, text in enumerate(texts):
-            cv2.putText(display_frame, text, (20, y_offset + i * line_height),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        # Paste the pre-rendered panel over the frame
+        cv2.copyTo(self._panel, self._panel_mask, display_frame[self._panel_roi])
         
         # Draw cursor position indicator
         cursor_x = info.get('cursor_cam_x')
@@ -83,6 +236,11 @@ class DebugUI:
             cv2.circle(display_frame, (int(cursor_x), int(cursor_y)), 
                       5, (0, 0, 255), -1)
         
-        # Show frame
-        cv2.imshow(self.window_name, display_frame)
-        cv2.waitKey(1)
\ No newline at end of file
+        # Hand the frame to the display thread, replacing any stale one
+        try:
+            stale, pooled = self._frames.get_nowait()
+            if pooled:
+                self._free.put(stale)
+        except queue.Empty:
+            pass
+        self._frames.put_nowait((display_frame, not inplace))
\ No newline at end of file
@@ -9,8 +9,6 @@ import argparse
 import logging
 from pathlib import Path
 
-from aerocontrol.cli import setup_logging, main as cli_main
-
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -71,6 +69,9 @@ Examples:
 if __name__ == '__main__':
     args = parse_arguments()
     
+    # Imported after parsing so --help does not load OpenCV and MediaPipe
+    from aerocontrol.cli import setup_logging, main as cli_main
+    
     # Setup logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
     setup_logging(log_level)
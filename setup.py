@@ -26,9 +26,12 @@ setup(
         "mediapipe>=0.10.0",
         "numpy>=1.24.0",
         "python-uinput>=0.11.2",
-        "pyautogui>=0.9.54",
         "PyYAML>=6.0",
     ],
+    extras_require={
+        "jit": ["numba>=0.58"],
+        "fallback": ["pyautogui>=0.9.54"],
+    },
     entry_points={
         "console_scripts": [
             "aerocontrol=main:main",
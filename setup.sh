@@ -80,6 +80,15 @@ echo "[5/6] Installing AeroControl package..."
 pip3 install --user -e .
 echo "✓ AeroControl installed"
 
+# The model lives next to config.yaml, where detector.model_path is resolved
+MODEL_FILE="$(cd "$(dirname "$0")" && pwd)/hand_landmarker.task"
+if [ ! -f "$MODEL_FILE" ]; then
+    wget -q -O "$MODEL_FILE" \
+        https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task \
+        && echo "✓ Hand landmark model downloaded" \
+        || echo "⚠ Could not download hand landmark model (see README)"
+fi
+
 # Test installation
 echo ""
 echo "[6/6] Testing installation..."
@@ -0,0 +1,34 @@
+"""
+Shared fixtures for AeroControl tests.
+"""
+
+import pytest
+import numpy as np
+
+
+@pytest.fixture(scope="module")
+def synthetic_hand():
+    """
+    Factory for synthetic hand data.
+    
+    Landmark arrays are built once per pose and shared read-only across the
+    tests of a module; each call returns a fresh hand dictionary. The uid is
+    an integer track id, as assigned by the detector.
+    """
+    cache = {}
+    
+    def create(index_pos, thumb_pos=None, handedness='Right', uid=0):
+        key = (tuple(index_pos), tuple(thumb_pos) if thumb_pos else None)
+        landmarks = cache.get(key)
+        if landmarks is None:
+            landmarks = np.zeros((21, 3), dtype=np.float32)
+            landmarks[8, :2] = index_pos  # Index finger
+            if thumb_pos:
+                landmarks[4, :2] = thumb_pos  # Thumb
+            landmarks.flags.writeable = False
+            cache[key] = landmarks
+        
+        return {'landmarks': landmarks, 'handedness': handedness, 'uid': uid,
+                'raw_landmarks': None}
+    
+    return create
@@ -0,0 +1,71 @@
+"""
+Unit tests for calibration module.
+"""
+
+import pytest
+import numpy as np
+import cv2
+from aerocontrol.calibrate import Calibrator
+
+
+class TestCalibrator:
+    """Test camera-to-screen mapping."""
+
+    @pytest.fixture
+    def calibrator(self):
+        """Create calibrator with a skewed four-point calibration."""
+        calibrator = Calibrator(1920, 1080)
+        calibrator.add_calibration_point((100.0, 80.0), (50, 50))
+        calibrator.add_calibration_point((540.0, 100.0), (1870, 50))
+        calibrator.add_calibration_point((560.0, 400.0), (1870, 1030))
+        calibrator.add_calibration_point((90.0, 390.0), (50, 1030))
+        assert calibrator.compute_transform()
+        return calibrator
+
+    def test_fallback_mapping(self):
+        """Test linear mapping without calibration."""
+        calibrator = Calibrator(1920, 1080)
+        assert calibrator.map_to_screen((320.0, 240.0)) == (960, 540)
+
+    def test_matches_perspective_transform(self, calibrator):
+        """Test scalar mapping agrees with cv2.perspectiveTransform."""
+        for camera_pos in [(100.0, 80.0), (300.0, 250.0), (450.5, 123.25)]:
+            point = np.array([[camera_pos]], dtype=np.float32)
+            expected = cv2.perspectiveTransform(point, calibrator.transform_matrix)[0][0]
+
+            x, y = calibrator.map_to_screen(camera_pos)
+            assert abs(x - expected[0]) <= 1
+            assert abs(y - expected[1]) <= 1
+
+    def test_clamped_to_screen(self, calibrator):
+        """Test mapped positions are clamped to screen bounds."""
+        x, y = calibrator.map_to_screen((0.0, 0.0))
+        assert 0 <= x < 1920
+        assert 0 <= y < 1080
+
+    def test_sub_pixel_movement_reuses_last_result(self, calibrator):
+        """Test sub-pixel camera jitter maps to the same screen point."""
+        first = calibrator.map_to_screen((300.0, 250.0))
+        assert calibrator.map_to_screen((300.3, 249.8)) == first
+        assert calibrator.map_to_screen((305.0, 250.0)) != first
+
+    def test_warp_frame_matches_warp_perspective(self, calibrator):
+        """Test precomputed remap agrees with cv2.warpPerspective."""
+        frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+        frame = cv2.GaussianBlur(frame, (9, 9), 3)
+
+        warped = calibrator.warp_frame(frame)
+        expected = cv2.warpPerspective(frame, calibrator.transform_matrix, (1920, 1080))
+
+        assert warped.shape == (1080, 1920, 3)
+        assert np.abs(warped.astype(int) - expected).max() <= 2
+
+    def test_remap_tables_built_lazily(self, calibrator):
+        """Test remap tables are built on first warp and dropped on recalibration."""
+        assert calibrator._map1 is None
+
+        calibrator.warp_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+        assert calibrator._map1 is not None
+
+        assert calibrator.compute_transform()
+        assert calibrator._map1 is None
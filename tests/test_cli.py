@@ -0,0 +1,68 @@
+"""
+Unit tests for CLI configuration loading.
+"""
+
+import os
+import pytest
+from aerocontrol.cli import load_config, get_default_config, resolve_model_path
+
+
+class TestLoadConfig:
+    """Test configuration loading and caching."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        """Write a small YAML config."""
+        path = tmp_path / "config.yaml"
+        path.write_text("gestures:\n  pinch_threshold: 35\n")
+        return path
+
+    def test_missing_file_uses_defaults(self, tmp_path):
+        """Test defaults are returned when the file does not exist."""
+        assert load_config(str(tmp_path / "missing.yaml")) == get_default_config()
+
+    def test_cache_written_and_reused(self, config_file):
+        """Test parsed config is cached as JSON and reused."""
+        config = load_config(str(config_file))
+        cache_file = config_file.with_name(".config.yaml.json")
+
+        assert config == {'gestures': {'pinch_threshold': 35}}
+        assert cache_file.exists()
+        assert load_config(str(config_file)) == config
+
+    def test_cache_invalidated_on_change(self, config_file):
+        """Test an edited YAML file is parsed again."""
+        load_config(str(config_file))
+
+        config_file.write_text("gestures:\n  pinch_threshold: 50\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_config(str(config_file)) == {'gestures': {'pinch_threshold': 50}}
+
+
+class TestResolveModelPath:
+    """Test hand model path resolution."""
+
+    def test_relative_to_config_dir(self, tmp_path):
+        """Test a relative model path is resolved next to the config file."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("detector:\n  model_path: models/hand.task\n")
+
+        config = resolve_model_path(load_config(str(config_file)), str(config_file))
+        assert config['detector']['model_path'] == str(tmp_path / "models" / "hand.task")
+
+    def test_absolute_path_unchanged(self, tmp_path):
+        """Test an absolute model path is kept as-is."""
+        model = str(tmp_path / "hand.task")
+        config = resolve_model_path({'detector': {'model_path': model}}, "missing.yaml")
+        assert config['detector']['model_path'] == model
+
+    def test_missing_config_uses_project_dir(self, tmp_path, monkeypatch):
+        """Test defaults resolve against the project, not the working directory."""
+        monkeypatch.chdir(tmp_path)
+        config = resolve_model_path(get_default_config(), "config.yaml")
+
+        model_path = config['detector']['model_path']
+        assert os.path.isabs(model_path)
+        assert not model_path.startswith(str(tmp_path))
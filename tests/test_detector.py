@@ -0,0 +1,307 @@
+"""
+Unit tests for the hand detector's detect/track scheduling.
+"""
+
+from collections import namedtuple
+import numpy as np
+import pytest
+from aerocontrol.detector import HandDetector
+
+
+Landmark = namedtuple('Landmark', 'x y z')
+Category = namedtuple('Category', 'category_name')
+Result = namedtuple('Result', 'hand_landmarks handedness')
+
+FRAME_SIZE = (320, 240)
+
+
+def make_result(wrist=(0.5, 0.5), label='Right'):
+    """Build a HandLandmarker result with one hand offset from the wrist."""
+    hand = [Landmark(wrist[0] + 0.01 * i, wrist[1] - 0.01 * i, 0.0) for i in range(21)]
+    return Result([hand], [[Category(label)]])
+
+
+def merge_results(*results):
+    """Combine single-hand results into one multi-hand result."""
+    return Result([hand for r in results for hand in r.hand_landmarks],
+                  [label for r in results for label in r.handedness])
+
+
+NO_HANDS = Result([], [])
+
+
+class FakeLandmarker:
+    """
+    Live-stream landmarker stand-in.
+
+    Each detect_async() call completes the previous submission with the next
+    queued result, so results lag one frame as with real async inference.
+    With lag=False the result is delivered before detect_async() returns;
+    with deliver=False submissions never complete, as when MediaPipe is busy.
+    """
+
+    def __init__(self, detector, lag=False):
+        self.detector = detector
+        self.lag = lag
+        self.deliver = True
+        self.results = []
+        self.timestamps = []
+        self._pending = None
+
+    def detect_async(self, image, timestamp_ms):
+        self.timestamps.append(timestamp_ms)
+        if not self.deliver:
+            return
+        result = self.results.pop(0) if self.results else NO_HANDS
+        if self.lag:
+            result, self._pending = self._pending, (result, timestamp_ms)
+            if result is None:
+                return
+            result, timestamp_ms = result
+        self.detector._on_result(result, image, timestamp_ms)
+
+    @property
+    def calls(self):
+        """Number of submissions after the warmup frame."""
+        return len(self.timestamps) - 1
+
+
+@pytest.fixture
+def make_detector(monkeypatch):
+    """Factory for HandDetectors backed by a FakeLandmarker."""
+    def init_landmarker(self, model_path, *args, **kwargs):
+        self.landmarker = FakeLandmarker(self)
+
+    monkeypatch.setattr(HandDetector, '_init_landmarker', init_landmarker)
+
+    def create(lag=False, **kwargs):
+        # Any existing file selects the HandLandmarker path
+        detector = HandDetector(model_path=__file__, input_width=FRAME_SIZE[0],
+                                input_height=FRAME_SIZE[1], **kwargs)
+        detector.landmarker.lag = lag
+        return detector
+
+    return create
+
+
+@pytest.fixture(scope="module")
+def textured_frame():
+    """Noise frame optical flow can lock onto."""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+    frame.flags.writeable = False
+    return frame
+
+
+class TestDetectTrackSchedule:
+    """Test full detection every N frames with tracking in between."""
+
+    def test_detects_every_nth_frame(self, make_detector, textured_frame):
+        """Test landmarker runs on every third frame and tracks the rest."""
+        detector = make_detector(detect_every=3)
+        landmarker = detector.landmarker
+        landmarker.results = [make_result()] * 3
+
+        submitted = []
+        for _ in range(6):
+            hands = detector.detect(textured_frame)
+            assert hands is not None and len(hands) == 1
+            submitted.append(landmarker.calls)
+
+        # Frame 1 has no hands to track, frames 3 and 6 are detection frames
+        assert submitted == [1, 1, 2, 2, 2, 3]
+
+    def test_tracked_frames_keep_hand_position(self, make_detector, textured_frame):
+        """Test tracking a static frame leaves landmarks in place."""
+        detector = make_detector(detect_every=3)
+        detector.landmarker.results = [make_result(wrist=(0.4, 0.6))]
+
+        detected = detector.detect(textured_frame)[0]
+        tracked = detector.detect(textured_frame)[0]
+
+        assert detector.landmarker.calls == 1
+        np.testing.assert_allclose(tracked['landmarks'], detected['landmarks'], atol=0.5)
+        assert tracked['handedness'] == detected['handedness']
+
+    def test_detect_every_one_never_tracks(self, make_detector, textured_frame):
+        """Test every frame is submitted when detect_every is 1."""
+        detector = make_detector(detect_every=1)
+        detector.landmarker.results = [make_result()] * 4
+
+        for _ in range(4):
+            detector.detect(textured_frame)
+
+        assert detector.landmarker.calls == 4
+
+
+class TestTrackingLoss:
+    """Test failed tracking falls back to detection."""
+
+    def test_flow_error_falls_back_to_detection(self, make_detector, textured_frame):
+        """Test a tracking error above the limit triggers detection."""
+        # No flow error is below zero, so every tracking attempt fails
+        detector = make_detector(detect_every=3, track_max_error=-1.0)
+        detector.landmarker.results = [make_result()] * 3
+
+        for _ in range(3):
+            assert detector.detect(textured_frame) is not None
+
+        assert detector.landmarker.calls == 3
+
+    def test_lost_hand_is_not_tracked(self, make_detector, textured_frame):
+        """Test frames after a no-hand detection are detected, not tracked."""
+        detector = make_detector(detect_every=3)
+        detector.landmarker.results = [make_result(), NO_HANDS, NO_HANDS]
+
+        assert detector.detect(textured_frame) is not None
+        assert detector.detect(textured_frame) is not None  # tracked
+        assert detector.detect(textured_frame) is None      # detection frame
+        assert detector.detect(textured_frame) is None      # nothing to track
+
+        assert detector.landmarker.calls == 3
+
+
+class TestAsyncResults:
+    """Test handling of results that complete after the frame is submitted."""
+
+    def test_returns_latest_completed_result(self, make_detector, textured_frame):
+        """Test each detection frame returns the previous frame's result."""
+        detector = make_detector(detect_every=1, lag=True)
+        landmarker = detector.landmarker
+        landmarker.results = [make_result(wrist=(0.2, 0.5)), make_result(wrist=(0.7, 0.5))]
+
+        # The warmup submission completes with no hands
+        assert detector.detect(textured_frame) is None
+        first = detector.detect(textured_frame)
+        second = detector.detect(textured_frame)
+
+        assert first[0]['landmarks'][0, 0] == pytest.approx(0.2 * FRAME_SIZE[0])
+        assert second[0]['landmarks'][0, 0] == pytest.approx(0.7 * FRAME_SIZE[0])
+
+    def test_stale_hands_cleared_by_empty_result(self, make_detector, textured_frame):
+        """Test a completed no-hand result replaces the previous hands."""
+        detector = make_detector(detect_every=1, lag=True)
+        detector.landmarker.results = [make_result(), NO_HANDS]
+
+        detector.detect(textured_frame)
+        assert detector.detect(textured_frame) is not None
+        assert detector.detect(textured_frame) is None
+
+    def test_pending_detection_keeps_tracking(self, make_detector, textured_frame):
+        """Test a detection frame without a new result keeps the tracked hands."""
+        detector = make_detector(detect_every=2)
+        detector.landmarker.results = [make_result(wrist=(0.4, 0.5))]
+
+        detected = detector.detect(textured_frame)
+        detector.landmarker.deliver = False
+        later = [detector.detect(textured_frame) for _ in range(3)]
+
+        # Frames 2 and 4 were submitted but never completed
+        assert detector.landmarker.calls == 3
+        for hands in later:
+            assert hands is not None
+            assert hands[0]['uid'] == detected[0]['uid']
+            np.testing.assert_allclose(hands[0]['landmarks'], detected[0]['landmarks'],
+                                       atol=0.5)
+
+    def test_result_taken_once(self, make_detector, textured_frame):
+        """Test a completed result is not reapplied on later detection frames."""
+        detector = make_detector(detect_every=1)
+        detector.landmarker.results = [make_result(wrist=(0.4, 0.5))]
+
+        first = detector.detect(textured_frame)
+        detector.landmarker.deliver = False
+        second = detector.detect(textured_frame)
+
+        # The previous hands are kept, and the callback's copy is left untagged
+        assert second is first
+        _, callback_hands = detector._latest_result
+        assert callback_hands[0] is not first[0]
+        assert 'uid' not in callback_hands[0]
+
+    def test_late_result_tracked_forward(self, make_detector, textured_frame):
+        """Test a result for an earlier frame is shifted to the current frame."""
+        detector = make_detector(detect_every=2, lag=True)
+        detector.landmarker.results = [make_result(wrist=(0.5, 0.5))]
+        moved_frame = np.roll(textured_frame, 4, axis=1)
+
+        # Submitted on the first frame, completed while the second is processed
+        assert detector.detect(textured_frame) is None
+        hands = detector.detect(moved_frame)
+
+        assert hands[0]['landmarks'][0, 0] == pytest.approx(0.5 * FRAME_SIZE[0] + 4, abs=0.5)
+
+    def test_result_uses_submitted_frame_size(self, make_detector, textured_frame):
+        """Test landmarks are scaled to the size of the original frame."""
+        detector = make_detector(detect_every=1)
+        detector.landmarker.results = [make_result(wrist=(0.5, 0.25))]
+        big_frame = np.zeros((FRAME_SIZE[1] * 2, FRAME_SIZE[0] * 2, 3), dtype=np.uint8)
+
+        hands = detector.detect(big_frame)
+
+        np.testing.assert_allclose(hands[0]['landmarks'][0, :2],
+                                   (FRAME_SIZE[0], FRAME_SIZE[1] * 0.5))
+
+    def test_timestamps_strictly_increase(self, make_detector, textured_frame):
+        """Test live-stream timestamps never repeat, even within a millisecond."""
+        detector = make_detector(detect_every=1)
+
+        for _ in range(20):
+            detector.detect(textured_frame)
+
+        timestamps = detector.landmarker.timestamps
+        assert all(b > a for a, b in zip(timestamps, timestamps[1:]))
+
+
+class TestHandUids:
+    """Test hands keep a per-track uid independent of their handedness label."""
+
+    def test_same_label_hands_get_distinct_uids(self, make_detector, textured_frame):
+        """Test two hands reported with the same label are told apart."""
+        detector = make_detector(detect_every=1)
+        detector.landmarker.results = [merge_results(make_result(wrist=(0.2, 0.5)),
+                                                     make_result(wrist=(0.7, 0.5)))]
+
+        hands = detector.detect(textured_frame)
+
+        assert hands[0]['handedness'] == hands[1]['handedness']
+        assert hands[0]['uid'] != hands[1]['uid']
+
+    def test_uid_survives_label_flicker(self, make_detector, textured_frame):
+        """Test a hand keeps its uid when its handedness label changes."""
+        detector = make_detector(detect_every=1)
+        detector.landmarker.results = [make_result(wrist=(0.5, 0.5), label='Right'),
+                                       make_result(wrist=(0.52, 0.5), label='Left')]
+
+        first = detector.detect(textured_frame)[0]
+        second = detector.detect(textured_frame)[0]
+
+        assert second['handedness'] != first['handedness']
+        assert second['uid'] == first['uid']
+
+    def test_uid_follows_hand_across_tracked_frames(self, make_detector, textured_frame):
+        """Test tracked frames and the next detection keep each hand's uid."""
+        detector = make_detector(detect_every=3)
+        detector.landmarker.results = [
+            merge_results(make_result(wrist=(0.2, 0.5)), make_result(wrist=(0.7, 0.5))),
+            # Same hands, reported in the opposite order
+            merge_results(make_result(wrist=(0.71, 0.5)), make_result(wrist=(0.21, 0.5))),
+        ]
+
+        detected = detector.detect(textured_frame)
+        tracked = detector.detect(textured_frame)
+        redetected = detector.detect(textured_frame)
+
+        assert [h['uid'] for h in tracked] == [h['uid'] for h in detected]
+        assert [h['uid'] for h in redetected] == [detected[1]['uid'], detected[0]['uid']]
+
+    def test_distant_hand_gets_new_uid(self, make_detector, textured_frame):
+        """Test a hand far from every previous hand starts a new track."""
+        detector = make_detector(detect_every=1)
+        detector.landmarker.results = [make_result(wrist=(0.1, 0.5)),
+                                       make_result(wrist=(0.9, 0.5))]
+
+        first = detector.detect(textured_frame)[0]
+        second = detector.detect(textured_frame)[0]
+
+        assert second['uid'] != first['uid']
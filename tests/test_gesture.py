@@ -3,6 +3,7 @@ Unit tests for gesture recognition.
 """
 
 import pytest
+import numpy as np
 from aerocontrol.gesture import GestureRecognizer, GestureType
 
 
@@ -29,22 +30,12 @@ class TestGestureRecognizer:
     def create_hand_data(self, thumb_pos, index_pos, middle_pos=(0, 0), 
                         ring_pos=(0, 0), pinky_pos=(0, 0)):
         """Helper to create hand landmark data."""
-        landmarks = []
-        
-        # Add all 21 landmarks (simplified)
-        for i in range(21):
-            if i == 4:  # Thumb tip
-                landmarks.append({'x': thumb_pos[0], 'y': thumb_pos[1], 'z': 0})
-            elif i == 8:  # Index tip
-                landmarks.append({'x': index_pos[0], 'y': index_pos[1], 'z': 0})
-            elif i == 12:  # Middle tip
-                landmarks.append({'x': middle_pos[0], 'y': middle_pos[1], 'z': 0})
-            elif i == 16:  # Ring tip
-                landmarks.append({'x': ring_pos[0], 'y': ring_pos[1], 'z': 0})
-            elif i == 20:  # Pinky tip
-                landmarks.append({'x': pinky_pos[0], 'y': pinky_pos[1], 'z': 0})
-            else:
-                landmarks.append({'x': 0, 'y': 0, 'z': 0})
+        landmarks = np.zeros((21, 3), dtype=np.float32)
+        landmarks[4, :2] = thumb_pos  # Thumb tip
+        landmarks[8, :2] = index_pos  # Index tip
+        landmarks[12, :2] = middle_pos  # Middle tip
+        landmarks[16, :2] = ring_pos  # Ring tip
+        landmarks[20, :2] = pinky_pos  # Pinky tip
         
         return {'landmarks': landmarks}
     
@@ -95,4 +86,57 @@ class TestGestureRecognizer:
         )
         
         gesture, data = recognizer.recognize(hand_data, dt=0.033)
-        assert gesture == GestureType.RIGHT_CLICK
\ No newline at end of file
+        assert gesture == GestureType.RIGHT_CLICK
+    
+    def create_four_finger_landmarks(self, y):
+        """Helper to create aligned four-fingertip landmarks at height y."""
+        hand_data = self.create_hand_data(
+            thumb_pos=(0, 0),
+            index_pos=(100, y),
+            middle_pos=(120, y),
+            ring_pos=(140, y),
+            pinky_pos=(160, y)
+        )
+        return hand_data['landmarks']
+    
+    def test_swipe_up_detection(self, recognizer):
+        """Test four-finger swipe up."""
+        assert recognizer._check_four_finger_swipe(
+            self.create_four_finger_landmarks(300), 10.0) == GestureType.NONE
+        
+        gesture = recognizer._check_four_finger_swipe(
+            self.create_four_finger_landmarks(150), 10.2)
+        assert gesture == GestureType.SWIPE_UP
+        assert not recognizer.swipe_active
+    
+    def test_swipe_down_detection(self, recognizer):
+        """Test four-finger swipe down."""
+        recognizer._check_four_finger_swipe(self.create_four_finger_landmarks(100), 10.0)
+        
+        gesture = recognizer._check_four_finger_swipe(
+            self.create_four_finger_landmarks(250), 10.2)
+        assert gesture == GestureType.SWIPE_DOWN
+    
+    def test_swipe_too_slow(self, recognizer):
+        """Test slow vertical movement is not a swipe."""
+        recognizer._check_four_finger_swipe(self.create_four_finger_landmarks(300), 10.0)
+        
+        gesture = recognizer._check_four_finger_swipe(
+            self.create_four_finger_landmarks(150), 11.0)
+        assert gesture == GestureType.NONE
+        assert recognizer.swipe_active
+    
+    def test_swipe_reset_when_fingers_misaligned(self, recognizer):
+        """Test swipe state resets when fingertips are not aligned."""
+        recognizer._check_four_finger_swipe(self.create_four_finger_landmarks(300), 10.0)
+        assert recognizer.swipe_active
+        
+        hand_data = self.create_hand_data(
+            thumb_pos=(0, 0),
+            index_pos=(100, 100),
+            middle_pos=(120, 300)
+        )
+        gesture = recognizer._check_four_finger_swipe(
+            hand_data['landmarks'], 10.2)
+        assert gesture == GestureType.NONE
+        assert not recognizer.swipe_active
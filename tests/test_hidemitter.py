@@ -0,0 +1,151 @@
+"""
+Unit tests for uinput event emission.
+"""
+
+import os
+import pytest
+from aerocontrol.hidemitter import HIDEmitter, _INPUT_EVENT
+
+
+EV_SYN = 0
+EV_KEY = 1
+EV_REL = 2
+REL_X = 0
+REL_Y = 1
+BTN_LEFT = 0x110
+# Mouse button code range (BTN_MOUSE..BTN_TASK)
+BTN_MOUSE_LAST = 0x117
+
+SCREEN = (1920, 1080)
+
+
+@pytest.fixture
+def emitter(monkeypatch):
+    """HIDEmitter whose uinput device writes into a pipe."""
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+
+    def init_uinput(self):
+        self._uinput_fd = write_fd
+        self.device = object()
+
+    monkeypatch.setattr(HIDEmitter, '_check_uinput', lambda self: True)
+    monkeypatch.setattr(HIDEmitter, '_init_uinput', init_uinput)
+
+    hid = HIDEmitter(*SCREEN)
+    hid.read_fd = read_fd
+    yield hid
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def read_events(hid):
+    """Read and unpack all events written so far as (type, code, value)."""
+    try:
+        data = os.read(hid.read_fd, 4096)
+    except BlockingIOError:
+        return []
+    assert len(data) % _INPUT_EVENT.size == 0
+    return [fields[2:] for fields in _INPUT_EVENT.iter_unpack(data)]
+
+
+class TestDeviceEvents:
+    """Test the capabilities registered on the virtual device."""
+
+    @pytest.mark.parametrize("enable_scroll", [True, False])
+    def test_device_is_mouse_only(self, emitter, enable_scroll):
+        """Test only relative axes and mouse buttons are registered."""
+        emitter.enable_scroll = enable_scroll
+
+        for ev_type, code in emitter._device_events():
+            assert ev_type == EV_REL or (ev_type == EV_KEY and
+                                         BTN_LEFT <= code <= BTN_MOUSE_LAST)
+
+    def test_scroll_wheel_optional(self, emitter):
+        """Test the wheel axis is registered only with scrolling enabled."""
+        emitter.enable_scroll = False
+        without_scroll = emitter._device_events()
+        emitter.enable_scroll = True
+
+        assert len(emitter._device_events()) == len(without_scroll) + 1
+
+
+class TestEventPacking:
+    """Test events are written as packed input_event records."""
+
+    def test_move_writes_rel_and_syn(self, emitter):
+        """Test a diagonal move writes REL_X, REL_Y and SYN_REPORT."""
+        start_x, start_y = emitter.current_x, emitter.current_y
+        emitter.move_mouse(start_x + 5, start_y - 3)
+
+        assert read_events(emitter) == [(EV_REL, REL_X, 5), (EV_REL, REL_Y, -3),
+                                        (EV_SYN, 0, 0)]
+        assert (emitter.current_x, emitter.current_y) == (start_x + 5, start_y - 3)
+
+    def test_single_axis_move(self, emitter):
+        """Test a horizontal move writes no REL_Y event."""
+        emitter.move_mouse(emitter.current_x - 7, emitter.current_y)
+
+        assert read_events(emitter) == [(EV_REL, REL_X, -7), (EV_SYN, 0, 0)]
+
+    def test_move_clamped_to_screen(self, emitter):
+        """Test targets off screen move only to the edge."""
+        emitter.move_mouse(-100, SCREEN[1] + 100)
+
+        assert read_events(emitter) == [(EV_REL, REL_X, -(SCREEN[0] // 2)),
+                                        (EV_REL, REL_Y, SCREEN[1] // 2 - 1),
+                                        (EV_SYN, 0, 0)]
+
+    def test_click_is_one_write(self, emitter):
+        """Test press and release reports are packed together."""
+        emitter.click('left')
+
+        assert read_events(emitter) == [(EV_KEY, BTN_LEFT, 1), (EV_SYN, 0, 0),
+                                        (EV_KEY, BTN_LEFT, 0), (EV_SYN, 0, 0)]
+
+
+class TestDeadband:
+    """Test moves that do not change the cursor position are skipped."""
+
+    def test_unchanged_position_not_written(self, emitter):
+        """Test moving to the current position writes nothing."""
+        emitter.move_mouse(emitter.current_x, emitter.current_y)
+
+        assert read_events(emitter) == []
+
+    def test_subpixel_move_not_written(self, emitter):
+        """Test a target rounding to the current pixel writes nothing."""
+        emitter.move_mouse(100, 100)
+        read_events(emitter)
+
+        emitter.move_mouse(100.3, 99.8)
+
+        assert read_events(emitter) == []
+
+
+class TestCoalescing:
+    """Test queued moves collapse to the newest target."""
+
+    def test_pending_moves_coalesced(self, emitter):
+        """Test only the last of several queued moves is emitted."""
+        start_x, start_y = emitter.current_x, emitter.current_y
+
+        # Mark the emitter thread running without starting it, so moves pile up
+        emitter._emit_running = True
+        for step in range(1, 4):
+            emitter.queue_move(start_x + step, start_y)
+        assert emitter.coalesced_moves == 2
+        assert read_events(emitter) == []
+
+        # One pass of the emitter loop drains the pending target and exits
+        emitter._emit_running = False
+        emitter._emit_loop()
+
+        assert read_events(emitter) == [(EV_REL, REL_X, 3), (EV_SYN, 0, 0)]
+
+    def test_move_direct_when_thread_stopped(self, emitter):
+        """Test queue_move writes immediately without the emitter thread."""
+        emitter.queue_move(emitter.current_x, emitter.current_y + 2)
+
+        assert read_events(emitter) == [(EV_REL, REL_Y, 2), (EV_SYN, 0, 0)]
+        assert emitter.coalesced_moves == 0
@@ -0,0 +1,63 @@
+"""
+Unit tests for threaded pipeline stages.
+"""
+
+import queue
+import numpy as np
+from aerocontrol.pipeline import put_latest, DetectionWorker
+
+
+class FakeCamera:
+    """Camera that yields numbered frames."""
+
+    def __init__(self):
+        self.last_frame_id = 0
+        self.last_frame_time = 0
+
+    def read(self):
+        self.last_frame_id += 1
+        self.last_frame_time += 33_000_000
+        return True, np.full((4, 4, 3), self.last_frame_id % 256, dtype=np.uint8)
+
+
+class FakeDetector:
+    """Detector that reports one hand per frame."""
+
+    def detect(self, frame):
+        return [{'frame_value': int(frame[0, 0, 0])}]
+
+
+class TestPutLatest:
+    """Test drop-oldest queue insertion."""
+
+    def test_put_into_free_queue(self):
+        """Test no drop when queue has room."""
+        q = queue.Queue(maxsize=2)
+        assert not put_latest(q, 1)
+        assert q.qsize() == 1
+
+    def test_drops_oldest_when_full(self):
+        """Test oldest item is dropped when queue is full."""
+        q = queue.Queue(maxsize=2)
+        put_latest(q, 1)
+        put_latest(q, 2)
+        assert put_latest(q, 3)
+        assert [q.get_nowait(), q.get_nowait()] == [2, 3]
+
+
+class TestDetectionWorker:
+    """Test background detection worker."""
+
+    def test_produces_results(self):
+        """Test worker publishes frame and detection result."""
+        worker = DetectionWorker(FakeCamera(), FakeDetector())
+        worker.start()
+        try:
+            ret, frame, hands_data = worker.read(timeout=2.0)
+        finally:
+            worker.stop()
+
+        assert ret
+        assert hands_data[0]['frame_value'] == int(frame[0, 0, 0])
+        assert (worker.last_frame_time // 33_000_000) % 256 == int(frame[0, 0, 0])
+        assert worker.processed_frames > 0
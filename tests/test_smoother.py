@@ -4,7 +4,8 @@ Unit tests for smoother module.
 
 import pytest
 import numpy as np
-from aerocontrol.smoother import AdaptiveSmoother, KalmanSmoother
+from aerocontrol.smoother import (AdaptiveSmoother, KalmanSmoother, _velocity_offset,
+                                  _ema_step, _kalman_step)
 
 
 class TestAdaptiveSmoother:
@@ -59,6 +60,38 @@ class TestAdaptiveSmoother:
         
         assert alpha_far > alpha_near
     
+    def test_alpha_is_clamped_float(self):
+        """Test adaptive alpha is clamped and stays a plain float."""
+        smoother = AdaptiveSmoother(alpha_base=0.5, alpha_min=0.1, alpha_max=0.7)
+        smoother.smooth((100.0, 100.0), hand_scale=150.0)
+        
+        smoother.smooth((200.0, 200.0), hand_scale=1000.0)
+        assert type(smoother.get_current_alpha()) is float
+        assert smoother.get_current_alpha() == 0.7
+        
+        smoother.smooth((200.0, 200.0), hand_scale=10.0)
+        assert smoother.get_current_alpha() == 0.1
+    
+    def test_converges_to_constant_target(self):
+        """Test fixed-point EMA settles on a held position without drift."""
+        smoother = AdaptiveSmoother(alpha_base=0.3)
+        smoother.smooth((100.0, 100.0), hand_scale=150.0)
+        
+        for _ in range(200):
+            pos = smoother.smooth((300.25, -5.5), hand_scale=150.0)
+        
+        assert abs(pos[0] - 300.25) < 1e-3
+        assert abs(pos[1] + 5.5) < 1e-3
+    
+    def test_epsilon_holds_resting_position(self):
+        """Test sub-epsilon movement returns the previous smoothed position."""
+        smoother = AdaptiveSmoother(alpha_base=0.3, epsilon=0.5)
+        smoother.smooth((100.0, 100.0), hand_scale=150.0)
+        pos = smoother.smooth((110.0, 100.0), hand_scale=150.0)
+        
+        assert smoother.smooth((pos[0] + 0.4, pos[1] - 0.4), hand_scale=150.0) == pos
+        assert smoother.smooth((pos[0] + 0.6, pos[1]), hand_scale=150.0) != pos
+    
     def test_reset(self):
         """Test smoother reset."""
         smoother = AdaptiveSmoother()
@@ -100,4 +133,56 @@ class TestKalmanSmoother:
         raw_var = np.var([m[0] for m in measurements])
         filtered_var = np.var([f[0] for f in filtered])
         
-        assert filtered_var < raw_var or len(filtered) < 3  # May need more samples
\ No newline at end of file
+        assert filtered_var < raw_var or len(filtered) < 3  # May need more samples
+    
+    def test_tracks_constant_velocity(self):
+        """Test filter converges on steady linear motion."""
+        kalman = KalmanSmoother(process_noise=0.01, measurement_noise=1.0)
+        
+        for i in range(50):
+            pos = kalman.smooth((100.0 + 5.0 * i, 200.0 - 3.0 * i))
+        
+        assert abs(pos[0] - 345.0) < 1.0
+        assert abs(pos[1] - 53.0) < 1.0
+        assert abs(kalman.state[2] - 5.0) < 0.5
+        assert abs(kalman.state[3] + 3.0) < 0.5
+
+
+class TestVelocityOffset:
+    """Test velocity-based cursor offset."""
+    
+    def test_below_min_velocity(self):
+        """Test slow motion gets no offset."""
+        assert _velocity_offset(3.0, 4.0, 5.0, 0.6, 1.0, 10.0) == (0.0, 0.0)
+    
+    def test_offset_along_motion(self):
+        """Test offset follows the direction of motion."""
+        off_x, off_y = _velocity_offset(-3.0, 4.0, 100.0, 1.0, 0.1, 10.0)
+        assert abs(off_x + 6.0) < 1e-6
+        assert abs(off_y - 8.0) < 1e-6
+
+
+class TestKernels:
+    """Test JIT kernels agree with their pure-Python fallback."""
+    
+    @staticmethod
+    def python_version(kernel):
+        """Get the uncompiled function (the kernel itself without numba)."""
+        return getattr(kernel, 'py_func', kernel)
+    
+    def test_ema_step_matches_python(self):
+        """Test compiled EMA step matches the Python fallback."""
+        args = (123.4, 56.7, 100 << 16, 50 << 16, 120.0, 0.3, 0.1, 0.7, 0.5, 150.0)
+        assert _ema_step(*args) == self.python_version(_ema_step)(*args)
+    
+    def test_kalman_step_matches_python(self):
+        """Test compiled Kalman step matches the Python fallback."""
+        state = (100.0, 200.0, 1.0, -1.0)
+        cov = (1.0, 0.1, 0.2, 0.0, 1.0, 0.0, 0.2, 1.0, 0.0, 1.0)
+        args = (state, cov, 103.0, 198.0, 0.01, 1.0)
+        
+        compiled_state, compiled_cov = _kalman_step(*args)
+        python_state, python_cov = self.python_version(_kalman_step)(*args)
+        
+        assert np.allclose(compiled_state, python_state)
+        assert np.allclose(compiled_cov, python_cov)